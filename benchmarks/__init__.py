@@ -0,0 +1 @@
+"""Benchmarks for the Alarme Personnalisee integration."""
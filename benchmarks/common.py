@@ -0,0 +1,107 @@
+"""Helpers for the Alarme Personnalisee benchmarks."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import timedelta
+from statistics import median
+from time import thread_time_ns
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.components.alarm_control_panel import DOMAIN as ALARM_DOMAIN
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from custom_components.alarme_personnalisee.alarm_control_panel import (
+    AlarmePersonnaliseeEntity,
+)
+from custom_components.alarme_personnalisee.const import DOMAIN
+from custom_components.alarme_personnalisee.data import async_get_domain_data
+
+# L'horloge est figee par freezer : les durees se mesurent en temps CPU du
+# thread de la boucle, que freezegun ne fige pas
+clock_ns = thread_time_ns
+
+
+def sensor_ids(count: int, name: str = "door") -> list[str]:
+    """Return the entity ids of count binary sensors."""
+    return [f"binary_sensor.{name}_{index}" for index in range(count)]
+
+
+async def async_setup_alarm(
+    hass: HomeAssistant, options: dict[str, Any]
+) -> tuple[MockConfigEntry, AlarmePersonnaliseeEntity]:
+    """Set up a config entry and return it with its alarm entity."""
+    entry = MockConfigEntry(domain=DOMAIN, title="Alarme", options=options)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry, async_get_domain_data(hass).entries[entry.entry_id].alarm
+
+
+async def async_advance(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float
+) -> None:
+    """Move the frozen clock forward and run the timers that are due."""
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+
+async def async_arm(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    alarm: AlarmePersonnaliseeEntity,
+    service: str = "alarm_arm_away",
+) -> None:
+    """Arm the alarm and let its arming delay run out."""
+    await hass.services.async_call(
+        ALARM_DOMAIN, service, {"entity_id": alarm.entity_id}, blocking=True
+    )
+    await async_advance(hass, freezer, alarm._arming_time + 1)
+
+
+async def async_disarm(hass: HomeAssistant, alarm: AlarmePersonnaliseeEntity) -> None:
+    """Disarm the alarm."""
+    await hass.services.async_call(
+        ALARM_DOMAIN, "alarm_disarm", {"entity_id": alarm.entity_id}, blocking=True
+    )
+
+
+async def async_time_state_change(
+    hass: HomeAssistant, entity_id: str, action: Callable[[], None]
+) -> int:
+    """Return the time from action to the next state write of entity_id."""
+    written: asyncio.Future[int] = hass.loop.create_future()
+
+    @callback
+    def state_written(event: Event) -> None:
+        if not written.done():
+            written.set_result(clock_ns())
+
+    unsub = async_track_state_change_event(hass, entity_id, state_written)
+    try:
+        start = clock_ns()
+        action()
+        return await written - start
+    finally:
+        unsub()
+
+
+def summarize(samples_ns: list[int]) -> dict[str, Any]:
+    """Return the distribution of durations in microseconds."""
+    samples = sorted(samples_ns)
+    return {
+        "runs": len(samples),
+        "min_us": round(samples[0] / 1000, 1),
+        "median_us": round(median(samples) / 1000, 1),
+        "p95_us": round(samples[int(len(samples) * 0.95) - 1] / 1000, 1),
+        "max_us": round(samples[-1] / 1000, 1),
+    }
@@ -0,0 +1,65 @@
+"""Fixtures for the Alarme Personnalisee benchmarks.
+
+Each benchmark records its figures with the record_benchmark fixture. They
+are written as JSON at the end of the session, to the file named by the
+ALARME_BENCHMARK_RESULTS environment variable (benchmarks/results.json by
+default), so that runs can be compared over time.
+"""
+from __future__ import annotations
+
+import json
+import os
+import platform
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from homeassistant.const import __version__ as HA_VERSION
+
+MANIFEST = Path(__file__).parents[1] / "custom_components" / "alarme_personnalisee" / "manifest.json"
+RESULTS_FILE = Path(
+    os.environ.get("ALARME_BENCHMARK_RESULTS", Path(__file__).parent / "results.json")
+)
+
+_results: dict[str, dict[str, Any]] = {}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components."""
+
+
+@pytest.fixture
+def record_benchmark(request: pytest.FixtureRequest) -> Callable[..., None]:
+    """Return a function recording the figures of the running benchmark."""
+
+    def record(**figures: Any) -> None:
+        _results[request.node.name] = figures
+
+    return record
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Write the recorded figures."""
+    if not _results:
+        return
+
+    manifest = json.loads(MANIFEST.read_text(encoding="utf-8"))
+    RESULTS_FILE.write_text(
+        json.dumps(
+            {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "version": manifest["version"],
+                "homeassistant": HA_VERSION,
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "benchmarks": dict(sorted(_results.items())),
+            },
+            indent=2,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
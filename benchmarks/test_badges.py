@@ -0,0 +1,126 @@
+"""Benchmarks of the badge disarm path."""
+from __future__ import annotations
+
+from functools import partial
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.components.alarm_control_panel.const import AlarmControlPanelState
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+
+from custom_components.alarme_personnalisee.const import (
+    CONF_BADGE_ENTITY,
+    CONF_BADGE_NAME,
+    CONF_BADGES,
+    EVENT_ALARM_DISARMED,
+    EVENT_BADGE_DISARM,
+)
+from custom_components.alarme_personnalisee.data import async_get_domain_data
+
+from .common import (
+    async_advance,
+    async_arm,
+    async_setup_alarm,
+    async_time_state_change,
+    clock_ns,
+    sensor_ids,
+    summarize,
+)
+
+SENSORS = 500
+RUNS = 200
+BURST = 10
+DELAY_TIME = 30
+BADGE_READER = "sensor.badge_reader"
+
+
+async def _async_setup_badge_alarm(hass: HomeAssistant, sensors: list[str]):
+    """Set up an alarm disarmed by a numeric badge reader."""
+    hass.states.async_set(BADGE_READER, STATE_OFF)
+    for sensor in sensors:
+        hass.states.async_set(sensor, STATE_OFF)
+    _, alarm = await async_setup_alarm(
+        hass,
+        {
+            "arming_time": 0,
+            "delay_time": DELAY_TIME,
+            "away_sensors": sensors,
+            CONF_BADGES: [{CONF_BADGE_ENTITY: BADGE_READER, CONF_BADGE_NAME: "Badge"}],
+        },
+    )
+    return alarm
+
+
+@pytest.mark.parametrize(
+    "from_state",
+    [
+        AlarmControlPanelState.ARMED_AWAY,
+        AlarmControlPanelState.PENDING,
+        AlarmControlPanelState.TRIGGERED,
+    ],
+)
+async def test_badge_to_disarmed_latency(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    from_state: AlarmControlPanelState,
+    record_benchmark,
+) -> None:
+    """Time from a badge scan to the DISARMED state."""
+    sensors = sensor_ids(SENSORS)
+    alarm = await _async_setup_badge_alarm(hass, sensors)
+
+    samples = []
+    for run in range(RUNS):
+        await async_arm(hass, freezer, alarm)
+        sensor = sensors[run % SENSORS]
+        if from_state != AlarmControlPanelState.ARMED_AWAY:
+            hass.states.async_set(sensor, STATE_ON)
+            await hass.async_block_till_done()
+        if from_state == AlarmControlPanelState.TRIGGERED:
+            await async_advance(hass, freezer, DELAY_TIME + 1)
+        assert alarm.state == from_state
+
+        samples.append(
+            await async_time_state_change(
+                hass, alarm.entity_id, partial(hass.states.async_set, BADGE_READER, str(run))
+            )
+        )
+        assert alarm.state == AlarmControlPanelState.DISARMED
+        hass.states.async_set(BADGE_READER, STATE_OFF)
+        hass.states.async_set(sensor, STATE_OFF)
+        await hass.async_block_till_done()
+
+    record_benchmark(**summarize(samples))
+
+
+async def test_badge_reader_burst(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, record_benchmark
+) -> None:
+    """A numeric reader changing value quickly disarms only once."""
+    alarm = await _async_setup_badge_alarm(hass, sensor_ids(SENSORS))
+    # Le journal est alimente de facon synchrone par le chemin de desarmement
+    recorded = []
+    async_get_domain_data(hass).journal.async_add_listener(
+        lambda event: recorded.append(event["event_type"])
+    )
+
+    samples = []
+    for run in range(RUNS):
+        await async_arm(hass, freezer, alarm)
+        recorded.clear()
+
+        start = clock_ns()
+        for value in range(BURST):
+            hass.states.async_set(BADGE_READER, f"{run}-{value}")
+        await hass.async_block_till_done()
+        samples.append(clock_ns() - start)
+
+        assert alarm.state == AlarmControlPanelState.DISARMED
+        assert recorded.count(EVENT_BADGE_DISARM) == 1
+        assert recorded.count(EVENT_ALARM_DISARMED) == 1
+        hass.states.async_set(BADGE_READER, STATE_OFF)
+        await hass.async_block_till_done()
+
+    record_benchmark(values_per_burst=BURST, **summarize(samples))
@@ -0,0 +1,90 @@
+"""Micro-benchmark of the sensor event handler against the number of sensors.
+
+The handler is called directly with prepared events, so only its own cost is
+measured; it must stay flat from 10 to 10,000 sensors.
+"""
+from __future__ import annotations
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.components.alarm_control_panel.const import AlarmControlPanelState
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON
+from homeassistant.core import Event, HomeAssistant, State
+
+from .common import async_arm, async_setup_alarm, clock_ns, sensor_ids
+
+SENSOR_COUNTS = (10, 100, 1000, 10000)
+EVENTS = 20000
+
+
+def _flapping_events(sensors: list[str]) -> list[Event]:
+    """Return EVENTS state changes opening then closing the sensors in turn."""
+    events = []
+    while len(events) < EVENTS:
+        for sensor in sensors:
+            closed, opened = State(sensor, STATE_OFF), State(sensor, STATE_ON)
+            events.append(
+                Event(
+                    EVENT_STATE_CHANGED,
+                    {"entity_id": sensor, "old_state": closed, "new_state": opened},
+                )
+            )
+            events.append(
+                Event(
+                    EVENT_STATE_CHANGED,
+                    {"entity_id": sensor, "old_state": opened, "new_state": closed},
+                )
+            )
+    return events[:EVENTS]
+
+
+@pytest.mark.parametrize(
+    "service",
+    [
+        # Alarme desarmee : seul le statut ouvert/ferme des capteurs change
+        None,
+        # Capteurs du mode absence, alarme armee en mode presence : ignores
+        "alarm_arm_home",
+    ],
+    ids=["disarmed", "other_mode"],
+)
+async def test_sensor_event_cost_by_sensor_count(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    service: str | None,
+    record_benchmark,
+) -> None:
+    """Mean cost of a sensor event for 10 to 10,000 sensors."""
+    mean_ns = {}
+    for count in SENSOR_COUNTS:
+        sensors = sensor_ids(count, f"door_{count}")
+        for sensor in sensors:
+            hass.states.async_set(sensor, STATE_OFF)
+        entry, alarm = await async_setup_alarm(
+            hass, {"arming_time": 0, "away_sensors": sensors}
+        )
+        if service is not None:
+            await async_arm(hass, freezer, alarm, service)
+        state = alarm.state
+        events = _flapping_events(sensors)
+
+        start = clock_ns()
+        for event in events:
+            alarm._sensor_state_changed(event)
+        elapsed = clock_ns() - start
+
+        assert alarm.state == state
+        if service is None:
+            assert state == AlarmControlPanelState.DISARMED
+        mean_ns[count] = round(elapsed / EVENTS)
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    record_benchmark(
+        events=EVENTS,
+        mean_ns_by_sensor_count=mean_ns,
+        ratio_largest_to_smallest=round(
+            mean_ns[SENSOR_COUNTS[-1]] / mean_ns[SENSOR_COUNTS[0]], 2
+        ),
+    )
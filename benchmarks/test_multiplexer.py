@@ -0,0 +1,63 @@
+"""Benchmark of the shared sensor multiplexer with many partitions.
+
+50 partitions (config entries) watch 500 sensors each, out of a pool of
+2,500: neighbouring partitions overlap, each sensor being watched by 10 of
+them, as zones sharing their doors and corridors.
+"""
+from __future__ import annotations
+
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+
+from custom_components.alarme_personnalisee.data import async_get_domain_data
+
+from .common import async_setup_alarm, clock_ns, sensor_ids
+
+PARTITIONS = 50
+SENSORS_PER_PARTITION = 500
+SENSOR_STEP = 50
+
+
+async def test_partitions_sharing_sensors(hass: HomeAssistant, record_benchmark) -> None:
+    """Subscriptions and cost per event for 50 partitions x 500 sensors."""
+    pool = sensor_ids(PARTITIONS * SENSOR_STEP)
+    for sensor in pool:
+        hass.states.async_set(sensor, STATE_OFF)
+
+    start = clock_ns()
+    for partition in range(PARTITIONS):
+        first = partition * SENSOR_STEP
+        sensors = [
+            pool[(first + index) % len(pool)] for index in range(SENSORS_PER_PARTITION)
+        ]
+        await async_setup_alarm(hass, {"away_sensors": sensors})
+    setup_ns = clock_ns() - start
+
+    domain_data = async_get_domain_data(hass)
+    # Un seul abonnement par capteur, quel que soit le nombre de partitions
+    assert domain_data.sensors.subscription_count == len(pool)
+
+    start = clock_ns()
+    for state in (STATE_ON, STATE_OFF):
+        for sensor in pool:
+            hass.states.async_set(sensor, state)
+    await hass.async_block_till_done()
+    elapsed = clock_ns() - start
+
+    events = 2 * len(pool)
+    deliveries = sum(
+        entry_data.stats.sensor_events.count for entry_data in domain_data.entries.values()
+    )
+    assert deliveries == events * PARTITIONS * SENSORS_PER_PARTITION // len(pool)
+    record_benchmark(
+        partitions=PARTITIONS,
+        sensors_per_partition=SENSORS_PER_PARTITION,
+        distinct_sensors=len(pool),
+        setup_ms=round(setup_ns / 1e6, 1),
+        subscriptions=domain_data.sensors.subscription_count,
+        subscriptions_without_multiplexer=PARTITIONS * SENSORS_PER_PARTITION,
+        events=events,
+        partitions_per_event=deliveries / events,
+        mean_us_per_event=round(elapsed / events / 1000, 2),
+        mean_us_per_partition=round(elapsed / deliveries / 1000, 2),
+    )
@@ -0,0 +1,191 @@
+"""Benchmarks of the alarm state machine.
+
+Run with ``pytest benchmarks``. Durations are the CPU time of the event loop
+thread, the clock being frozen; timers only run when the benchmark moves it.
+"""
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from functools import partial
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.components.alarm_control_panel.const import AlarmControlPanelState
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+
+from custom_components.alarme_personnalisee.data import async_get_domain_data
+
+from .common import (
+    async_arm,
+    async_disarm,
+    async_setup_alarm,
+    async_time_state_change,
+    clock_ns,
+    sensor_ids,
+    summarize,
+)
+
+SENSORS = 500
+RUNS = 200
+
+
+async def test_sensor_to_pending_latency(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, record_benchmark
+) -> None:
+    """Time from a sensor opening to the PENDING state."""
+    sensors = sensor_ids(SENSORS)
+    for sensor in sensors:
+        hass.states.async_set(sensor, STATE_OFF)
+    _, alarm = await async_setup_alarm(
+        hass, {"arming_time": 0, "delay_time": 30, "away_sensors": sensors}
+    )
+
+    samples = []
+    for run in range(RUNS):
+        await async_arm(hass, freezer, alarm)
+        sensor = sensors[run % SENSORS]
+        samples.append(
+            await async_time_state_change(
+                hass, alarm.entity_id, partial(hass.states.async_set, sensor, STATE_ON)
+            )
+        )
+        assert alarm.state == AlarmControlPanelState.PENDING
+        hass.states.async_set(sensor, STATE_OFF)
+        await async_disarm(hass, alarm)
+
+    record_benchmark(sensors=SENSORS, **summarize(samples))
+
+
+@pytest.mark.parametrize("sensor_count", [1000, 10000])
+async def test_sensor_event_throughput(
+    hass: HomeAssistant, sensor_count: int, record_benchmark
+) -> None:
+    """Sensor state changes handled per second of CPU time."""
+    sensors = sensor_ids(sensor_count)
+    for sensor in sensors:
+        hass.states.async_set(sensor, STATE_OFF)
+    _, alarm = await async_setup_alarm(hass, {"away_sensors": sensors})
+    stats = async_get_domain_data(hass).entries[alarm._entry.entry_id].stats
+
+    start = clock_ns()
+    for state in (STATE_ON, STATE_OFF):
+        for sensor in sensors:
+            hass.states.async_set(sensor, state)
+    await hass.async_block_till_done()
+    elapsed = clock_ns() - start
+
+    events = 2 * sensor_count
+    assert stats.sensor_events.count == events
+    record_benchmark(
+        sensors=sensor_count,
+        events=events,
+        events_per_second=round(events / elapsed * 1e9),
+        mean_us=round(elapsed / events / 1000, 2),
+    )
+
+
+async def test_options_reload_cost(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, record_benchmark
+) -> None:
+    """Cost of applying options: one value, the sensor lists, a full reload."""
+    sensors = sensor_ids(SENSORS)
+    for sensor in sensors:
+        hass.states.async_set(sensor, STATE_OFF)
+    entry, alarm = await async_setup_alarm(
+        hass, {"arming_time": 0, "away_sensors": sensors}
+    )
+    writer = async_get_domain_data(hass).entries[entry.entry_id].options_writer
+    await async_arm(hass, freezer, alarm)
+
+    # Option changee par une entite number : appliquee sans reabonnement
+    value_samples = []
+    for run in range(RUNS):
+        start = clock_ns()
+        writer.async_set("delay_time", 30 + run % 2)
+        await hass.async_block_till_done()
+        value_samples.append(clock_ns() - start)
+
+    # Listes de capteurs : seule la difference est (des)abonnee
+    sensor_samples = []
+    for run in range(RUNS):
+        start = clock_ns()
+        writer.async_set("away_sensors", sensors[run % 2 :])
+        await hass.async_block_till_done()
+        sensor_samples.append(clock_ns() - start)
+
+    # Flux d'options : l'entree est mise a jour, les entites suivent le signal
+    flow_samples = []
+    for run in range(RUNS):
+        start = clock_ns()
+        hass.config_entries.async_update_entry(
+            entry, options={**entry.options, "trigger_time": 180 + run % 2}
+        )
+        await hass.async_block_till_done()
+        flow_samples.append(clock_ns() - start)
+
+    reload_samples = []
+    for _ in range(20):
+        start = clock_ns()
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+        reload_samples.append(clock_ns() - start)
+
+    record_benchmark(
+        sensors=SENSORS,
+        option_value=summarize(value_samples),
+        sensor_lists=summarize(sensor_samples),
+        options_flow=summarize(flow_samples),
+        entry_reload=summarize(reload_samples),
+    )
+
+
+@pytest.mark.parametrize("entry_count", [1, 10, 100])
+async def test_setup_time(
+    hass: HomeAssistant, entry_count: int, record_benchmark
+) -> None:
+    """CPU time of setting up config entries, sharing the same sensors."""
+    sensors = sensor_ids(50)
+    for sensor in sensors:
+        hass.states.async_set(sensor, STATE_OFF)
+    # Premiere entree : chargement des plateformes, hors mesure
+    await async_setup_alarm(hass, {"away_sensors": sensors})
+
+    start = clock_ns()
+    for _ in range(entry_count):
+        await async_setup_alarm(hass, {"away_sensors": sensors})
+    elapsed = clock_ns() - start
+
+    record_benchmark(
+        entries=entry_count,
+        total_ms=round(elapsed / 1e6, 1),
+        per_entry_ms=round(elapsed / entry_count / 1e6, 2),
+    )
+
+
+async def test_memory_per_entry(hass: HomeAssistant, record_benchmark) -> None:
+    """Memory held by one config entry and its entities."""
+    entry_count = 20
+    sensors = sensor_ids(SENSORS)
+    for sensor in sensors:
+        hass.states.async_set(sensor, STATE_OFF)
+    await async_setup_alarm(hass, {"away_sensors": sensors})
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(entry_count):
+            await async_setup_alarm(hass, {"away_sensors": sensors})
+        gc.collect()
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    record_benchmark(
+        sensors=SENSORS,
+        entries=entry_count,
+        bytes_per_entry=allocated // entry_count,
+    )
@@ -4,12 +4,15 @@ from __future__ import annotations
 
 import logging
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant
 from homeassistant.const import Platform
-import voluptuous as vol
-from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 
-from .const import DOMAIN
+from .const import SIGNAL_OPTIONS_UPDATED
+
+from .data import AlarmeEntryData, async_get_domain_data
+from .services import async_setup_services, async_unload_services
+from .websocket import async_setup_websocket
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,55 +24,51 @@ PLATFORMS: list[Platform] = [
     Platform.NUMBER,
 ]
 
-SERVICE_RESET_TRIGGER_COUNT = "reset_trigger_count"
-
-SERVICE_RESET_TRIGGER_COUNT_SCHEMA = vol.Schema(
-    {
-        vol.Required("entity_id"): cv.entity_id,
-    }
-)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Alarme Personnalisée from a config entry."""
-    hass.data.setdefault(DOMAIN, {})
+    domain_data = async_get_domain_data(hass)
+    domain_data.entries[entry.entry_id] = AlarmeEntryData(hass, entry)
     
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Charger le journal des evenements (une seule fois pour toutes les entrees)
+    await domain_data.journal.async_load()
     
-    # Enregistrer le service reset_trigger_count (conservé pour compatibilité)
-    async def async_reset_trigger_count(call: ServiceCall) -> None:
-        """Reset the trigger count for the alarm."""
-        entity_id = call.data.get("entity_id")
-        
-        # Trouver l'entité dans hass.data
-        for entry_id, entity in hass.data.get(DOMAIN, {}).items():
-            if hasattr(entity, 'entity_id') and entity.entity_id == entity_id:
-                entity._triggered_count = 0
-                entity.async_write_ha_state()
-                _LOGGER.info("Trigger count reset for %s", entity_id)
-                return
-        
-        _LOGGER.warning("Could not find entity %s to reset trigger count", entity_id)
+    # Options modifiees par le flux d'options : meme signal que les entites number/switch
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
     
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_RESET_TRIGGER_COUNT,
-        async_reset_trigger_count,
-        schema=SERVICE_RESET_TRIGGER_COUNT_SCHEMA,
-    )
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    
+    # Enregistrer le service reset_trigger_count (partage par toutes les entrees)
+    await async_setup_services(hass)
+    async_setup_websocket(hass)
     
     _LOGGER.info("Alarme Personnalisée setup completed successfully")
     
     return True
 
 
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Tell the entities of the entry that its options changed."""
+    # Une valeur enregistree par le flux d'options remplace celle en attente
+    async_get_domain_data(hass).entries[entry.entry_id].options_writer.async_entry_updated()
+    async_dispatcher_send(hass, SIGNAL_OPTIONS_UPDATED.format(entry.entry_id))
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    # Supprimer le service
-    hass.services.async_remove(DOMAIN, SERVICE_RESET_TRIGGER_COUNT)
+    domain_data = async_get_domain_data(hass)
+    
+    # Enregistrer les options encore en attente avant de decharger
+    domain_data.entries[entry.entry_id].options_writer.async_shutdown()
     
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        domain_data.entries.pop(entry.entry_id, None)
+        
+        # Supprimer le service avec la derniere entree
+        if not domain_data.entries:
+            await async_unload_services(hass)
+            await domain_data.journal.async_flush()
     
     return unload_ok
@@ -2,7 +2,12 @@
 from __future__ import annotations
 
 import logging
+from collections import Counter, deque
 from datetime import datetime, timedelta
+from functools import partial
+from heapq import heapify, heappush
+from itertools import count
+from time import perf_counter_ns
 
 from homeassistant.components.alarm_control_panel import (
     AlarmControlPanelEntity,
@@ -11,15 +16,88 @@ from homeassistant.components.alarm_control_panel import (
 )
 from homeassistant.components.alarm_control_panel.const import AlarmControlPanelState
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.const import STATE_OFF, STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.restore_state import RestoredExtraData, RestoreEntity
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, CONF_BADGES
+from .const import (
+    EVENT_ALARM_ARMED,
+    EVENT_ALARM_DISARMED,
+    EVENT_ALARM_PENDING,
+    EVENT_ALARM_TRIGGERED,
+    EVENT_ARMING_CANCELLED,
+    EVENT_ARMING_REFUSED,
+    EVENT_BADGE_DISARM,
+    EVENT_EMERGENCY_DISARM,
+    SIGNAL_ALARM_UPDATED,
+    ATTR_LAST_CHANGED_AT,
+    ATTR_MONITORED_SENSORS,
+    ATTR_TIMER_DEADLINE,
+    ATTR_TIMER_PHASE,
+    ATTR_TRIGGERED_COUNT,
+    ATTR_CHATTERING_SENSORS,
+    ATTR_ENTRY_SENSOR,
+    ATTR_SUPPRESSED_EVENTS,
+    CONF_BADGES,
+    CONF_BADGE_ENTITY,
+    CONF_BADGE_NAME,
+    CONF_BLOCK_ARMING_IF_OPEN,
+    CONF_CHATTER_MAX_EVENTS,
+    CONF_CHATTER_WINDOW,
+    CONF_CONFIRMATION_COUNT,
+    CONF_CONFIRMATION_MODES,
+    CONF_CONFIRMATION_WINDOW,
+    CONF_FOLLOWER_SENSORS,
+    CONF_SKIP_CONFIRMATION_SENSORS,
+    CONF_MIN_ON_TIME,
+    CONF_SENSOR_DELAYS,
+    DEFAULT_CHATTER_MAX_EVENTS,
+    DEFAULT_CHATTER_WINDOW,
+    DEFAULT_CONFIRMATION_COUNT,
+    DEFAULT_CONFIRMATION_MODES,
+    DEFAULT_CONFIRMATION_WINDOW,
+    DEFAULT_MIN_ON_TIME,
+    SIGNAL_OPTIONS_UPDATED,
+    SIGNAL_SENSORS_UPDATED,
+    TIMER_PHASE_ARMING,
+    TIMER_PHASE_ENTRY,
+    TIMER_PHASE_TRIGGER,
+)
+from .data import async_get_domain_data
 
 _LOGGER = logging.getLogger(__name__)
 
+# Etats dans lesquels un badge peut desarmer l'alarme
+_BADGE_DISARM_STATES = frozenset(
+    {
+        AlarmControlPanelState.ARMED_AWAY,
+        AlarmControlPanelState.ARMED_HOME,
+        AlarmControlPanelState.ARMED_VACATION,
+        AlarmControlPanelState.PENDING,
+        AlarmControlPanelState.TRIGGERED,
+    }
+)
+
+# Etats d'un lecteur qui ne correspondent pas a un passage de badge.
+# Tout autre nouvel etat ("on", "unlocked", "open", valeur numerique...) en est un.
+_BADGE_IDLE_STATES = frozenset({STATE_OFF, STATE_UNKNOWN, STATE_UNAVAILABLE})
+
+# Statut d'un capteur surveille (les capteurs fermes ne sont dans aucun ensemble)
+_SENSOR_OPEN = "open"
+_SENSOR_CLOSED = "closed"
+_SENSOR_UNAVAILABLE = "unavailable"
+
+
+def _sensor_status(state: State | None) -> str:
+    """Return the status of a monitored sensor from its state."""
+    if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        return _SENSOR_UNAVAILABLE
+    return _SENSOR_OPEN if state.state == STATE_ON else _SENSOR_CLOSED
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -28,39 +106,73 @@ async def async_setup_entry(
 ) -> None:
     """Set up the alarm control panel platform."""
     entity = AlarmePersonnaliseeEntity(hass, entry)
+    async_get_domain_data(hass).entries[entry.entry_id].alarm = entity
     async_add_entities([entity])
-    
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = entity
 
-class AlarmePersonnaliseeEntity(AlarmControlPanelEntity):
+class AlarmePersonnaliseeEntity(AlarmControlPanelEntity, RestoreEntity):
     """Representation of an Alarme Personnalisee."""
     _attr_has_entity_name = True
+    # Etat ecrit a chaque changement : inutile de l'interroger
+    _attr_should_poll = False
+    # Attributs de configuration : inutile de les stocker a chaque changement d'etat
+    _unrecorded_attributes = frozenset(
+        {"supported_features_list", ATTR_MONITORED_SENSORS, "configured_badges"}
+    )
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the alarm control panel."""
         self.hass = hass
         self._entry = entry
+        self._domain_data = async_get_domain_data(hass)
+        self._entry_data = self._domain_data.entries[entry.entry_id]
+        self._stats = self._entry_data.stats
         self._attr_unique_id = entry.entry_id
         self._attr_name = "Alarme"
         self._state = AlarmControlPanelState.DISARMED
         self._last_armed_state = None
         self._timer_handle = None
+        self._timer_phase = None
+        self._timer_action = None
+        self._timer_delay = None
+        self._timer_deadline = None
         self._last_triggered_by = None
+        self._last_triggered_by_name = None
         self._last_changed_at = None
         self._triggered_count = 0
+        # Utilisateur ayant demande l'armement en cours (journal)
+        self._arming_user_id: str | None = None
+        self._badges = None
+        self._badge_index = {}
+        self._static_attributes = None
+        # Statut de chaque capteur surveille et capteurs ouverts/indisponibles par mode
+        self._sensor_status: dict[str, str] = {}
+        self._sensors_by_status: dict[str, dict[str, set[str]]] = {
+            _SENSOR_OPEN: {},
+            _SENSOR_UNAVAILABLE: {},
+        }
+        # Anti-rebond et limitation par capteur : seau de jetons (jetons, instant),
+        # ouvertures en attente de la duree minimale, capteurs instables
+        self._token_buckets: dict[str, tuple[float, float]] = {}
+        self._sensor_confirmations = {}
+        self._chatter_clears = {}
+        self._suppressed_events: Counter[str] = Counter()
+        # Confirmation multi-zones : ouvertures recentes (instant, capteur) dans
+        # l'ordre chronologique et nombre d'ouvertures par capteur dans la fenetre
+        self._confirmation_events: deque[tuple[float, str]] = deque()
+        self._confirmation_counts: dict[str, int] = {}
+        # Echeances d'entree en attente (echeance, ordre, capteur, delai) : la
+        # plus proche, en tete du tas, est celle de la minuterie d'entree
+        self._entry_deadlines: list[tuple[datetime, int, str, float]] = []
+        self._entry_sequence = count()
 
         self._update_options()
-        self._unsub_listener = None
+        self._tracked_sensors = frozenset()
         self._unsub_badge_listener = None
-        self._unsub_options_update_listener = entry.add_update_listener(
-            self._options_update_listener
-        )
 
     @callback
     def _update_options(self):
-        """Update options from the config entry."""
-        options = self._entry.options
+        """Update options from the config entry (with changes not stored yet)."""
+        options = self._entry_data.options
         self._code = options.get("code", "")
         self._require_arm_code = options.get("require_arm_code", False)
         self._require_disarm_code = options.get("require_disarm_code", False)
@@ -69,38 +181,82 @@ class AlarmePersonnaliseeEntity(AlarmControlPanelEntity):
         self._delay_time = max(0, options.get("delay_time", 30))
         self._trigger_time = max(0, options.get("trigger_time", 180))
         self._rearm_after_trigger = options.get("rearm_after_trigger", False)
+        self._block_arming_if_open = options.get(CONF_BLOCK_ARMING_IF_OPEN, False)
+        self._min_on_time = max(0, options.get(CONF_MIN_ON_TIME, DEFAULT_MIN_ON_TIME))
+        self._chatter_max_events = max(
+            0, options.get(CONF_CHATTER_MAX_EVENTS, DEFAULT_CHATTER_MAX_EVENTS)
+        )
+        self._chatter_window = max(1, options.get(CONF_CHATTER_WINDOW, DEFAULT_CHATTER_WINDOW))
+        self._confirmation_count = max(
+            1, options.get(CONF_CONFIRMATION_COUNT, DEFAULT_CONFIRMATION_COUNT)
+        )
+        self._confirmation_window = max(
+            1, options.get(CONF_CONFIRMATION_WINDOW, DEFAULT_CONFIRMATION_WINDOW)
+        )
+        self._confirmation_modes = frozenset(
+            options.get(CONF_CONFIRMATION_MODES, DEFAULT_CONFIRMATION_MODES)
+        )
+        self._skip_confirmation_sensors = frozenset(options.get(CONF_SKIP_CONFIRMATION_SENSORS, []))
+        self._sensor_delays = {
+            sensor: max(0, delay)
+            for sensor, delay in options.get(CONF_SENSOR_DELAYS, {}).items()
+        }
+        self._follower_sensors = frozenset(options.get(CONF_FOLLOWER_SENSORS, []))
         
-        # Badges configuration
-        self._badges = options.get(CONF_BADGES, [])
-        self._badge_entities = [badge["badge_entity"] for badge in self._badges]
+        # Badges configuration: entity -> badge index, rebuilt only when the list changes
+        badges = options.get(CONF_BADGES, [])
+        if badges != self._badges:
+            self._badges = list(badges)
+            self._badge_index = {badge[CONF_BADGE_ENTITY]: badge for badge in self._badges}
 
         self._away_sensors = options.get("away_sensors", [])
         self._home_sensors = options.get("home_sensors", [])
         self._vacation_sensors = options.get("vacation_sensors", [])
 
-        self._all_sensors = list(set(self._away_sensors + self._home_sensors + self._vacation_sensors))
+        # Index par mode : test d'appartenance en O(1) quel que soit le nombre de capteurs
+        self._sensors_by_mode = {
+            AlarmControlPanelState.ARMED_AWAY: frozenset(self._away_sensors),
+            AlarmControlPanelState.ARMED_HOME: frozenset(self._home_sensors),
+            AlarmControlPanelState.ARMED_VACATION: frozenset(self._vacation_sensors),
+        }
+        self._all_sensors = frozenset().union(*self._sensors_by_mode.values())
+        self._modes_by_sensor = {
+            sensor: tuple(
+                mode for mode, sensors in self._sensors_by_mode.items() if sensor in sensors
+            )
+            for sensor in self._all_sensors
+        }
+
+        # Les attributs de configuration seront recalcules a la prochaine ecriture
+        self._static_attributes = None
 
-    async def _options_update_listener(self, hass: HomeAssistant, entry: ConfigEntry):
-        """Handle options update."""
-        self._cancel_timer()
+    @callback
+    def _async_options_changed(self) -> None:
+        """Apply the current options.
+
+        Only what actually changed is reapplied: subscriptions are refreshed
+        when the sensor or badge sets change, and a running timer is kept, or
+        rescheduled when the duration of its phase changed.
+        """
+        badge_index = self._badge_index
+        sensors_by_mode = self._sensors_by_mode
         self._update_options()
-        if self._unsub_listener:
-            self._unsub_listener()
-        if self._unsub_badge_listener:
-            self._unsub_badge_listener()
         
-        # Track sensors
-        self._unsub_listener = async_track_state_change_event(
-            self.hass, self._all_sensors, self._sensor_state_changed
-        )
+        # Track sensors (only resubscribes if the sensor lists changed)
+        if self._sensors_by_mode != sensors_by_mode:
+            self._update_sensor_status()
+            self._async_publish_sensor_sets()
+            self._update_sensor_tracking()
         
-        # Track badges
-        if self._badge_entities:
-            self._unsub_badge_listener = async_track_state_change_event(
-                self.hass, self._badge_entities, self._badge_state_changed
-            )
+        # Track badges (the index is only rebuilt when the badge list changed)
+        if self._badge_index is not badge_index:
+            self._update_badge_tracking()
         
-        self.async_write_ha_state()
+        # Keep the running timer, adjusted to the new duration of its phase
+        if self._timer_phase is not None:
+            self._reschedule_timer()
+        
+        self._async_write_state()
 
     @property
     def state(self) -> str | None:
@@ -129,15 +285,8 @@ class AlarmePersonnaliseeEntity(AlarmControlPanelEntity):
     @property
     def extra_state_attributes(self) -> dict:
         """Return additional state attributes."""
-        features = self.supported_features
-        attrs = {
-            "supported_features_list": [
-                feature.name
-                for feature in AlarmControlPanelEntityFeature
-                if feature.value != 0 and features & feature
-            ],
-            "triggered_count": self._triggered_count,
-        }
+        start = perf_counter_ns()
+        attrs = {"triggered_count": self._triggered_count}
         
         if self._last_triggered_by:
             attrs["last_triggered_by"] = self._last_triggered_by
@@ -147,159 +296,654 @@ class AlarmePersonnaliseeEntity(AlarmControlPanelEntity):
             
         if self._last_armed_state:
             attrs["last_armed_state"] = self._last_armed_state
-            
-        attrs["monitored_sensors"] = {
-            "away": self._away_sensors,
-            "home": self._home_sensors,
-            "vacation": self._vacation_sensors,
-        }
         
-        attrs["configured_badges"] = len(self._badges)
+        # Echeance du timer en cours : les clients calculent le compte a rebours
+        if self._timer_phase:
+            attrs[ATTR_TIMER_PHASE] = self._timer_phase
+            attrs[ATTR_TIMER_DEADLINE] = self._timer_deadline.isoformat()
+        if self._entry_deadlines:
+            attrs[ATTR_ENTRY_SENSOR] = self._entry_deadlines[0][2]
         
+        attrs.update(self._get_static_attributes())
+        
+        self._stats.attributes.record(perf_counter_ns() - start)
         return attrs
 
+    def _get_static_attributes(self) -> dict:
+        """Return the configuration attributes, cached until the options change."""
+        if self._static_attributes is None:
+            features = self.supported_features
+            self._static_attributes = {
+                "supported_features_list": [
+                    feature.name
+                    for feature in AlarmControlPanelEntityFeature
+                    if feature.value != 0 and features & feature
+                ],
+                ATTR_MONITORED_SENSORS: {
+                    "away": self._away_sensors,
+                    "home": self._home_sensors,
+                    "vacation": self._vacation_sensors,
+                },
+                "configured_badges": len(self._badges),
+            }
+        return self._static_attributes
+
+    @callback
+    def diagnostics(self) -> dict:
+        """Return the runtime internals, read from the cached structures."""
+        return {
+            "state": self._state,
+            "last_armed_state": self._last_armed_state,
+            "sensors_by_mode": {
+                mode: len(sensors) for mode, sensors in self._sensors_by_mode.items()
+            },
+            "tracked_sensors": len(self._tracked_sensors),
+            "open_sensors_by_mode": {
+                mode: len(sensors)
+                for mode, sensors in self._sensors_by_status[_SENSOR_OPEN].items()
+            },
+            "unavailable_sensors_by_mode": {
+                mode: len(sensors)
+                for mode, sensors in self._sensors_by_status[_SENSOR_UNAVAILABLE].items()
+            },
+            "chattering_sensors": len(self._chatter_clears),
+            "pending_sensor_confirmations": len(self._sensor_confirmations),
+            "suppressed_events": sum(self._suppressed_events.values()),
+            "confirmation_window": {
+                "openings": len(self._confirmation_events),
+                "sensors": len(self._confirmation_counts),
+            },
+            "badges": len(self._badge_index),
+            "badge_subscription": self._unsub_badge_listener is not None,
+            "timer": {
+                "phase": self._timer_phase,
+                "delay": self._timer_delay if self._timer_phase else None,
+                "deadline": self._timer_deadline.isoformat() if self._timer_deadline else None,
+                "entry_deadlines": len(self._entry_deadlines),
+            },
+            ATTR_TRIGGERED_COUNT: self._triggered_count,
+            "last_triggered_by": self._last_triggered_by,
+            ATTR_LAST_CHANGED_AT: (
+                self._last_changed_at.isoformat() if self._last_changed_at else None
+            ),
+        }
+
+    @callback
+    def snapshot(self) -> dict:
+        """Return the values published to the companion sensors."""
+        return {
+            ATTR_TRIGGERED_COUNT: self._triggered_count,
+            "last_triggered_by": self._last_triggered_by,
+            "last_triggered_by_name": self._last_triggered_by_name,
+            ATTR_LAST_CHANGED_AT: self._last_changed_at,
+        }
+
+    @callback
+    def sensor_sets(self) -> tuple[dict[str, set[str]], dict[str, set[str]]]:
+        """Return the open and unavailable sensors of each mode.
+
+        These are the live sets, kept up to date by _update_sensor_state:
+        readers must copy them before keeping them.
+        """
+        return (
+            self._sensors_by_status[_SENSOR_OPEN],
+            self._sensors_by_status[_SENSOR_UNAVAILABLE],
+        )
+
+    @callback
+    def _async_write_state(self) -> None:
+        """Write the state and push the snapshot to the companion sensors."""
+        start = perf_counter_ns()
+        self.async_write_ha_state()
+        self._stats.state_writes.record(perf_counter_ns() - start)
+        self._async_publish_snapshot()
+
+    @callback
+    def _async_publish_snapshot(self) -> None:
+        """Push the snapshot to the companion sensors."""
+        async_dispatcher_send(
+            self.hass, SIGNAL_ALARM_UPDATED.format(self._entry.entry_id), self.snapshot()
+        )
+
+    @callback
+    def _async_publish_sensor_sets(self) -> None:
+        """Push the open and unavailable sets to the open sensors sensor."""
+        async_dispatcher_send(
+            self.hass, SIGNAL_SENSORS_UPDATED.format(self._entry.entry_id), *self.sensor_sets()
+        )
+
+    @property
+    def extra_restore_state_data(self) -> RestoredExtraData:
+        """Return the compact snapshot restored after a restart or a reload."""
+        return RestoredExtraData(
+            {
+                "state": self._state,
+                "last_armed_state": self._last_armed_state,
+                "triggered_count": self._triggered_count,
+                "last_triggered_by": self._last_triggered_by,
+                "last_triggered_by_name": self._last_triggered_by_name,
+                "last_changed_at": (
+                    self._last_changed_at.isoformat() if self._last_changed_at else None
+                ),
+                "timer_phase": self._timer_phase,
+                "timer_deadline": (
+                    self._timer_deadline.isoformat() if self._timer_deadline else None
+                ),
+                "entry_sensor": (
+                    self._entry_deadlines[0][2] if self._entry_deadlines else None
+                ),
+            }
+        )
+
+    @callback
+    def _async_restore(self, data: dict) -> None:
+        """Restore the state, counters and running timer of the snapshot.
+
+        A timer resumes with the time it had left; if its deadline passed
+        while Home Assistant was stopped, its phase ends right away.
+        """
+        try:
+            state = AlarmControlPanelState(data["state"])
+            last_armed_state = (
+                AlarmControlPanelState(data["last_armed_state"])
+                if data.get("last_armed_state")
+                else None
+            )
+        except (KeyError, ValueError):
+            _LOGGER.warning("Ignoring invalid restored alarm data: %s", data)
+            return
+
+        self._state = state
+        self._last_armed_state = last_armed_state
+        self._triggered_count = data.get("triggered_count", 0)
+        self._last_triggered_by = data.get("last_triggered_by")
+        self._last_triggered_by_name = data.get("last_triggered_by_name")
+        if last_changed_at := data.get("last_changed_at"):
+            self._last_changed_at = dt_util.parse_datetime(last_changed_at)
+
+        phase_actions = {
+            TIMER_PHASE_ARMING: self._finish_arming,
+            TIMER_PHASE_ENTRY: self._trigger_alarm,
+            TIMER_PHASE_TRIGGER: self._post_trigger_action,
+        }
+        phase = data.get("timer_phase")
+        deadline = data.get("timer_deadline")
+        if phase in phase_actions and deadline:
+            self._start_timer(phase, phase_actions[phase], dt_util.parse_datetime(deadline))
+            if phase == TIMER_PHASE_ENTRY:
+                entry_sensor = data.get("entry_sensor") or self._last_triggered_by
+                self._timer_delay = delay = self._entry_delay(entry_sensor)
+                self._entry_deadlines.append(
+                    (self._timer_deadline, next(self._entry_sequence), entry_sensor, delay)
+                )
+
+        _LOGGER.info("Alarm restored to %s", self._state)
+
+    @callback
+    def _record_event(self, event_type: str, data: dict | None = None) -> None:
+        """Add an event to the in-memory journal."""
+        self._domain_data.journal.async_record(self.entity_id, event_type, data)
+
+    def _service_user_id(self) -> str | None:
+        """Return the user of the service call being handled, if any."""
+        return self._context.user_id if self._context else None
+
+    @callback
+    def async_reset_trigger_count(self) -> None:
+        """Reset the trigger count."""
+        self._triggered_count = 0
+        self._async_write_state()
+
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
         await super().async_added_to_hass()
+        self._domain_data.async_register_alarm(self)
         
-        # Track sensors
-        self._unsub_listener = async_track_state_change_event(
-            self.hass, self._all_sensors, self._sensor_state_changed
+        # Reprendre l'etat d'avant le redemarrage (cache deja charge en memoire)
+        if (extra_data := await self.async_get_last_extra_data()) is not None:
+            self._async_restore(extra_data.as_dict())
+        
+        # Capteurs ouverts/indisponibles, depuis un seul instantane des etats
+        self._update_sensor_status()
+        self._async_publish_snapshot()
+        self._async_publish_sensor_sets()
+        
+        # Options modifiees par le flux d'options ou par les entites number/switch
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_OPTIONS_UPDATED.format(self._entry.entry_id),
+                self._async_options_changed,
+            )
         )
         
+        # Track sensors
+        self._update_sensor_tracking()
+        
         # Track badges
-        if self._badge_entities:
-            self._unsub_badge_listener = async_track_state_change_event(
-                self.hass, self._badge_entities, self._badge_state_changed
-            )
+        self._update_badge_tracking()
 
     async def async_will_remove_from_hass(self) -> None:
         """Run when entity will be removed from hass."""
         await super().async_will_remove_from_hass()
-        self._unsub_options_update_listener()
-        if self._unsub_listener:
-            self._unsub_listener()
+        self._domain_data.async_unregister_alarm(self)
+        self._tracked_sensors = frozenset()
+        self._domain_data.sensors.async_set_interest(
+            self._entry.entry_id, self._tracked_sensors, None
+        )
+        if self._unsub_badge_listener:
+            self._unsub_badge_listener()
+            self._unsub_badge_listener = None
+        for sensor in self._sensor_status:
+            self._forget_sensor(sensor)
+        self._cancel_timer()
+
+    @callback
+    def _update_sensor_tracking(self) -> None:
+        """Declare the sensors of every mode, whatever the alarm state.
+
+        The open and unavailable sets must follow the sensors while DISARMED
+        too, so the subscription only changes with the sensor lists. Events
+        of a sensor the current mode ignores stop at _update_sensor_state:
+        a status update and, on a change, SIGNAL_SENSORS_UPDATED.
+        """
+        sensors = self._all_sensors
+        if sensors == self._tracked_sensors:
+            return
+
+        # Abonnement partage entre toutes les partitions via le multiplexeur
+        self._tracked_sensors = sensors
+        self._domain_data.sensors.async_set_interest(
+            self._entry.entry_id, sensors, self._sensor_state_changed
+        )
+
+    @callback
+    def _update_sensor_status(self) -> None:
+        """Seed the status of new sensors and rebuild the per-mode sets.
+
+        Only the sensors not known yet are read from the state machine; the
+        status of the others is kept up to date by _update_sensor_state.
+        """
+        status = self._sensor_status
+        for sensor in status.keys() - self._all_sensors:
+            del status[sensor]
+            self._forget_sensor(sensor)
+        get_state = self.hass.states.get
+        for sensor in self._all_sensors - status.keys():
+            status[sensor] = _sensor_status(get_state(sensor))
+
+        self._sensors_by_status = {
+            sensor_status: {
+                mode: {sensor for sensor in sensors if status[sensor] == sensor_status}
+                for mode, sensors in self._sensors_by_mode.items()
+            }
+            for sensor_status in (_SENSOR_OPEN, _SENSOR_UNAVAILABLE)
+        }
+
+    @callback
+    def _forget_sensor(self, entity_id: str) -> None:
+        """Drop the debounce and rate limit state of a sensor."""
+        self._token_buckets.pop(entity_id, None)
+        self._suppressed_events.pop(entity_id, None)
+        if (confirmation := self._sensor_confirmations.pop(entity_id, None)) is not None:
+            confirmation.cancel()
+        if (chatter_clear := self._chatter_clears.pop(entity_id, None)) is not None:
+            chatter_clear.cancel()
+
+    @callback
+    def _update_sensor_state(self, entity_id: str, state: State | None) -> str | None:
+        """Move a sensor between the open/unavailable sets of its modes.
+
+        Returns the previous status of the sensor.
+        """
+        old_status = self._sensor_status.get(entity_id)
+        new_status = _sensor_status(state)
+        if old_status is None or old_status == new_status:
+            return old_status
+
+        self._sensor_status[entity_id] = new_status
+        for mode in self._modes_by_sensor[entity_id]:
+            if old_status != _SENSOR_CLOSED:
+                self._sensors_by_status[old_status][mode].discard(entity_id)
+            if new_status != _SENSOR_CLOSED:
+                self._sensors_by_status[new_status][mode].add(entity_id)
+        self._async_publish_sensor_sets()
+        return old_status
+
+    @callback
+    def _take_token(self, entity_id: str) -> bool:
+        """Take a token from the bucket of a sensor; False when it is empty.
+
+        Each bucket holds chatter_max_events tokens and refills over
+        chatter_window seconds. A sensor whose bucket runs empty is marked
+        chattering until its bucket has refilled.
+        """
+        capacity = self._chatter_max_events
+        if not capacity:
+            return True
+
+        now = self.hass.loop.time()
+        tokens, stamp = self._token_buckets.get(entity_id, (capacity, now))
+        tokens = min(capacity, tokens + (now - stamp) * capacity / self._chatter_window)
+        if tokens >= 1:
+            self._token_buckets[entity_id] = (tokens - 1, now)
+            return True
+
+        self._token_buckets[entity_id] = (tokens, now)
+        self._count_suppressed(entity_id)
+        if entity_id not in self._chatter_clears:
+            _LOGGER.warning("Sensor %s is chattering, its openings are ignored", entity_id)
+            self._schedule_chatter_clear(entity_id, tokens, now)
+        return False
+
+    @callback
+    def _schedule_chatter_clear(self, entity_id: str, tokens: float, stamp: float) -> None:
+        """Clear the chattering mark when the bucket of the sensor is full."""
+        capacity = self._chatter_max_events
+        delay = (capacity - tokens) * self._chatter_window / capacity
+        self._chatter_clears[entity_id] = self._domain_data.scheduler.async_schedule(
+            delay, partial(self._chatter_clear_fired, entity_id, stamp)
+        )
+
+    @callback
+    def _chatter_clear_fired(self, entity_id: str, stamp: float, now: datetime) -> None:
+        """Clear the chattering mark, or wait longer if the bucket is not full.
+
+        The delay refills the bucket as it was at stamp: if the sensor went on
+        since, the bucket changed and the tokens it took must come back first.
+        """
+        del self._chatter_clears[entity_id]
+        capacity = self._chatter_max_events
+        tokens, last = self._token_buckets.get(entity_id, (capacity, stamp))
+        if capacity and last != stamp:
+            tokens = min(
+                capacity,
+                tokens + (self.hass.loop.time() - last) * capacity / self._chatter_window,
+            )
+            if tokens < capacity:
+                self._schedule_chatter_clear(entity_id, tokens, last)
+                return
+        _LOGGER.info("Sensor %s is no longer chattering", entity_id)
+
+    @callback
+    def _count_suppressed(self, entity_id: str) -> None:
+        """Count an opening ignored by the debounce or the rate limit."""
+        self._suppressed_events[entity_id] += 1
+
+    @callback
+    def sensor_health(self) -> dict:
+        """Return the chattering sensors and the suppressed openings."""
+        return {
+            ATTR_CHATTERING_SENSORS: sorted(self._chatter_clears),
+            ATTR_SUPPRESSED_EVENTS: dict(self._suppressed_events),
+        }
+
+    @callback
+    def _update_badge_tracking(self) -> None:
+        """Listen to the configured badge readers."""
         if self._unsub_badge_listener:
             self._unsub_badge_listener()
+            self._unsub_badge_listener = None
+
+        if self._badge_index:
+            self._unsub_badge_listener = async_track_state_change_event(
+                self.hass, list(self._badge_index), self._badge_state_changed
+            )
+
+    def _timer_phase_delay(self, phase: str) -> int:
+        """Return the configured duration of a timer phase."""
+        if phase == TIMER_PHASE_ARMING:
+            return self._arming_time
+        if phase == TIMER_PHASE_ENTRY:
+            return self._delay_time
+        return self._trigger_time
+
+    def _entry_delay(self, entity_id: str) -> float:
+        """Return the entry delay started by a sensor.
+
+        A follower sensor has no delay when it opens first: it only follows
+        an entry delay already running.
+        """
+        if entity_id in self._follower_sensors:
+            return 0
+        return self._sensor_delays.get(entity_id, self._delay_time)
+
+    @callback
+    def _start_timer(
+        self,
+        phase: str,
+        action,
+        deadline: datetime | None = None,
+        delay: float | None = None,
+    ) -> None:
+        """Start the timer of a phase with its configured duration.
+
+        A deadline can be given to resume a timer, e.g. after a restart, and
+        a delay to override the duration of the phase.
+        """
         self._cancel_timer()
+        now = dt_util.utcnow()
+        self._timer_phase = phase
+        self._timer_action = action
+        self._timer_delay = self._timer_phase_delay(phase) if delay is None else delay
+        self._timer_deadline = deadline or now + timedelta(seconds=self._timer_delay)
+        self._timer_handle = self._domain_data.scheduler.async_schedule(
+            max(0, (self._timer_deadline - now).total_seconds()), self._timer_fired
+        )
+
+    @callback
+    def _move_timer(self, deadline: datetime, delay: float) -> None:
+        """Move the running timer to a new deadline, keeping its phase."""
+        self._timer_handle.cancel()
+        self._timer_deadline = deadline
+        self._timer_delay = delay
+        remaining = (deadline - dt_util.utcnow()).total_seconds()
+        self._timer_handle = self._domain_data.scheduler.async_schedule(
+            max(0, remaining), self._timer_fired
+        )
+
+    @callback
+    def _reschedule_timer(self) -> None:
+        """Apply a new phase duration to the running timer, keeping its start."""
+        if self._timer_phase == TIMER_PHASE_ENTRY and self._entry_deadlines:
+            self._reschedule_entry_deadlines()
+            return
+
+        delay = self._timer_phase_delay(self._timer_phase)
+        if delay == self._timer_delay:
+            return
+
+        _LOGGER.debug(
+            "Rescheduling %s timer from %s to %s seconds", self._timer_phase, self._timer_delay, delay
+        )
+        self._move_timer(
+            self._timer_deadline + timedelta(seconds=delay - self._timer_delay), delay
+        )
+
+    @callback
+    def _reschedule_entry_deadlines(self) -> None:
+        """Apply the new entry delays to the pending deadlines, keeping their start."""
+        entries = []
+        for deadline, sequence, entity_id, delay in self._entry_deadlines:
+            new_delay = self._entry_delay(entity_id)
+            entries.append(
+                (deadline + timedelta(seconds=new_delay - delay), sequence, entity_id, new_delay)
+            )
+        heapify(entries)
+        self._entry_deadlines = entries
+
+        deadline, _, entity_id, delay = entries[0]
+        if deadline != self._timer_deadline:
+            _LOGGER.debug("Rescheduling entry timer to %s, set by %s", deadline, entity_id)
+            self._move_timer(deadline, delay)
+
+    @callback
+    def _timer_fired(self, now: datetime) -> None:
+        """Run the action of the phase whose timer expired."""
+        drift = (now - self._timer_deadline).total_seconds()
+        self._stats.timer_drift.record(max(0, int(drift * 1_000_000_000)))
+        action = self._timer_action
+        self._timer_handle = None
+        self._timer_phase = None
+        self._timer_action = None
+        self._timer_deadline = None
+        action(now)
 
     def _cancel_timer(self):
-        """Cancel the timer."""
+        """Cancel the timer and forget the pending entry deadlines."""
         if self._timer_handle:
-            self._timer_handle()
+            self._timer_handle.cancel()
             self._timer_handle = None
+        self._timer_phase = None
+        self._timer_action = None
+        self._timer_deadline = None
+        self._entry_deadlines.clear()
 
     @callback
     def _badge_state_changed(self, event: Event) -> None:
-        """Handle badge state changes."""
+        """Handle badge state changes and account for their cost."""
+        start = perf_counter_ns()
+        relevant = self._handle_badge_event(event)
+        self._stats.badge_events.record(perf_counter_ns() - start)
+        if relevant:
+            self._stats.relevant_events += 1
+        else:
+            self._stats.ignored_events += 1
+
+    @callback
+    def _handle_badge_event(self, event: Event) -> bool:
+        """Disarm on a badge scan; return False when the event is ignored."""
         new_state = event.data.get("new_state")
         old_state = event.data.get("old_state")
         
         if new_state is None:
-            return
+            return False
 
         entity_id = event.data.get("entity_id")
         if not entity_id:
-            return
+            return False
 
         # Check if alarm is armed or triggered
-        if self._state not in [
-            AlarmControlPanelState.ARMED_AWAY,
-            AlarmControlPanelState.ARMED_HOME,
-            AlarmControlPanelState.ARMED_VACATION,
-            AlarmControlPanelState.PENDING,
-            AlarmControlPanelState.TRIGGERED,
-        ]:
-            return
+        if self._state not in _BADGE_DISARM_STATES:
+            return False
 
-        # Find badge name
-        badge_name = None
-        for badge in self._badges:
-            if badge["badge_entity"] == entity_id:
-                badge_name = badge["badge_name"]
-                break
-
-        # Detect badge activation (state change from off to on, or value change)
-        badge_activated = False
-        if old_state is None or new_state.state != old_state.state:
-            # Binary sensor or sensor with value change
-            if new_state.state in ["on", "unlocked", "open"]:
-                badge_activated = True
-            # For numeric sensors, any change could be a badge scan
-            elif new_state.state not in ["off", "unknown", "unavailable"]:
-                badge_activated = True
-
-        if badge_activated:
-            _LOGGER.info("Badge %s (%s) used to disarm alarm", badge_name or entity_id, entity_id)
-            
-            # Emit event
-            self.hass.bus.async_fire(
-                f"{DOMAIN}.badge_disarm",
-                {
-                    "entity_id": self.entity_id,
-                    "badge_name": badge_name or "Unknown",
-                    "badge_entity": entity_id,
-                    "timestamp": dt_util.utcnow().isoformat(),
-                },
-            )
-            
-            # Disarm the alarm
-            self.hass.async_create_task(self._perform_disarm(validation=(True, False)))
+        # Detect badge activation (state change from off to on, or value change).
+        # For numeric sensors, any change could be a badge scan.
+        badge_activated = (
+            old_state is None or new_state.state != old_state.state
+        ) and new_state.state not in _BADGE_IDLE_STATES
+
+        if not badge_activated:
+            return False
+
+        badge = self._badge_index.get(entity_id)
+        badge_name = badge[CONF_BADGE_NAME] if badge else None
+        _LOGGER.info("Badge %s (%s) used to disarm alarm", badge_name or entity_id, entity_id)
+        
+        # Emit event
+        self._record_event(
+            EVENT_BADGE_DISARM,
+            {"badge_name": badge_name or "Unknown", "badge_entity": entity_id},
+        )
+        self.hass.bus.async_fire(
+            EVENT_BADGE_DISARM,
+            {
+                "entity_id": self.entity_id,
+                "badge_name": badge_name or "Unknown",
+                "badge_entity": entity_id,
+                "timestamp": dt_util.utcnow().isoformat(),
+            },
+        )
+        
+        # Disarm the alarm right away: later scans of the same badge then
+        # find the alarm already disarmed and are ignored
+        self._perform_disarm(validation=(True, False))
+        return True
 
     @callback
     def _sensor_state_changed(self, event: Event) -> None:
-        """Handle sensor state changes."""
-        new_state = event.data.get("new_state")
-        if new_state is None or new_state.state != "on":
-            return
+        """Handle sensor state changes and account for their cost."""
+        start = perf_counter_ns()
+        relevant = self._handle_sensor_event(event)
+        self._stats.sensor_events.record(perf_counter_ns() - start)
+        if relevant:
+            self._stats.relevant_events += 1
+        else:
+            self._stats.ignored_events += 1
 
+    @callback
+    def _handle_sensor_event(self, event: Event) -> bool:
+        """React to a sensor opening; return False when the event is ignored."""
         entity_id = event.data.get("entity_id")
         if not entity_id:
             _LOGGER.warning("Sensor state change event without entity_id")
-            return
+            return False
 
-        # Surveiller les capteurs pendant l'armement ET quand arme
-        if self._state not in [
-            AlarmControlPanelState.ARMING,
-            AlarmControlPanelState.ARMED_AWAY,
-            AlarmControlPanelState.ARMED_HOME,
-            AlarmControlPanelState.ARMED_VACATION,
-        ]:
-            return
+        new_state = event.data.get("new_state")
+        old_status = self._update_sensor_state(entity_id, new_state)
+        if new_state is None or new_state.state != STATE_ON:
+            # Fermeture avant la duree minimale d'ouverture : rebond ignore
+            if (confirmation := self._sensor_confirmations.pop(entity_id, None)) is not None:
+                confirmation.cancel()
+                self._count_suppressed(entity_id)
+            return False
 
-        # Determiner quels capteurs surveiller selon le mode cible
-        if self._state == AlarmControlPanelState.ARMING:
-            # En cours d'armement, verifier selon le mode cible
-            if self._last_armed_state == AlarmControlPanelState.ARMED_AWAY:
-                is_relevant_sensor = entity_id in self._away_sensors
-            elif self._last_armed_state == AlarmControlPanelState.ARMED_HOME:
-                is_relevant_sensor = entity_id in self._home_sensors
-            elif self._last_armed_state == AlarmControlPanelState.ARMED_VACATION:
-                is_relevant_sensor = entity_id in self._vacation_sensors
-            else:
-                return
-        else:
-            # Deja arme, verifier selon l'etat actuel
-            is_relevant_sensor = (
-                (self._state == AlarmControlPanelState.ARMED_AWAY and entity_id in self._away_sensors)
-                or (self._state == AlarmControlPanelState.ARMED_HOME and entity_id in self._home_sensors)
-                or (self._state == AlarmControlPanelState.ARMED_VACATION and entity_id in self._vacation_sensors)
+        # Seul le passage de ferme a ouvert compte : ni une mise a jour d'attributs,
+        # ni un capteur qui revient deja ouvert d'un etat indisponible/inconnu
+        # (demarrage, rechargement de son integration, reconnexion Zigbee), dont
+        # seul le statut change
+        if old_status != _SENSOR_CLOSED or not self._is_sensor_relevant(entity_id):
+            return False
+
+        if not self._take_token(entity_id):
+            return False
+
+        if self._min_on_time:
+            self._sensor_confirmations[entity_id] = self._domain_data.scheduler.async_schedule(
+                self._min_on_time, partial(self._sensor_confirmed, entity_id)
             )
+            return True
 
-        if not is_relevant_sensor:
-            return
+        self._sensor_opened(entity_id, new_state)
+        return True
+
+    @callback
+    def _is_sensor_relevant(self, entity_id: str) -> bool:
+        """Return True when the sensor acts on the alarm in its current state."""
+        # Surveiller les capteurs pendant l'armement (selon le mode cible), pendant le
+        # delai d'entree (une echeance plus proche peut l'emporter) ET quand arme.
+        # Les autres etats (DISARMED, TRIGGERED) n'ont pas d'entree dans l'index.
+        if self._state in (AlarmControlPanelState.ARMING, AlarmControlPanelState.PENDING):
+            relevant_sensors = self._sensors_by_mode.get(self._last_armed_state)
+        else:
+            relevant_sensors = self._sensors_by_mode.get(self._state)
 
+        return relevant_sensors is not None and entity_id in relevant_sensors
+
+    @callback
+    def _sensor_confirmed(self, entity_id: str, now: datetime) -> None:
+        """Act on a sensor still open after the minimum open time."""
+        del self._sensor_confirmations[entity_id]
+        if self._sensor_status.get(entity_id) == _SENSOR_OPEN and self._is_sensor_relevant(
+            entity_id
+        ):
+            self._sensor_opened(entity_id, self.hass.states.get(entity_id))
+
+    @callback
+    def _sensor_opened(self, entity_id: str, new_state: State | None) -> None:
+        """Cancel arming or start the entry delay after a sensor opened."""
         # Si on est en cours d'armement et qu'un capteur se declenche, annuler l'armement
         if self._state == AlarmControlPanelState.ARMING:
             _LOGGER.warning("Arming cancelled: sensor %s triggered during arming delay", entity_id)
             self._cancel_timer()
             self._state = AlarmControlPanelState.DISARMED
             self._last_armed_state = None
-            self.async_write_ha_state()
+            self._async_write_state()
             
             # Emettre un evenement personnalise
+            self._record_event(EVENT_ARMING_CANCELLED, {"sensor": entity_id})
             self.hass.bus.async_fire(
-                f"{DOMAIN}.arming_cancelled",
+                EVENT_ARMING_CANCELLED,
                 {
                     "entity_id": self.entity_id,
                     "cancelled_by": entity_id,
@@ -308,51 +952,148 @@ class AlarmePersonnaliseeEntity(AlarmControlPanelEntity):
             )
             return
 
+        if self._state == AlarmControlPanelState.PENDING:
+            self._add_entry_deadline(entity_id)
+            return
+
+        if not self._confirm_opening(entity_id):
+            return
+
         # Sinon, comportement normal (passage en PENDING)
         _LOGGER.info("Alarm pending due to sensor %s", entity_id)
         self._last_triggered_by = entity_id
+        self._last_triggered_by_name = (
+            new_state.attributes.get("friendly_name", entity_id) if new_state else entity_id
+        )
         self._state = AlarmControlPanelState.PENDING
         self._last_changed_at = dt_util.utcnow()
-        self.async_write_ha_state()
-        self._timer_handle = async_call_later(self.hass, self._delay_time, self._trigger_alarm)
+        delay = self._entry_delay(entity_id)
+        self._start_timer(TIMER_PHASE_ENTRY, self._trigger_alarm, delay=delay)
+        self._entry_deadlines.append(
+            (self._timer_deadline, next(self._entry_sequence), entity_id, delay)
+        )
+        self._async_write_state()
+        self._record_event(EVENT_ALARM_PENDING, {"sensor": entity_id, "delay": delay})
+
+    @callback
+    def _add_entry_deadline(self, entity_id: str) -> None:
+        """Queue the entry deadline of a sensor opening during the entry delay.
+
+        The earliest deadline wins: the timer only moves when the new one
+        comes first, a later one just waits in the queue. A follower sensor
+        follows the running entry delay.
+        """
+        if entity_id in self._follower_sensors:
+            return
+
+        delay = self._sensor_delays.get(entity_id, self._delay_time)
+        deadline = dt_util.utcnow() + timedelta(seconds=delay)
+        entry = (deadline, next(self._entry_sequence), entity_id, delay)
+        heappush(self._entry_deadlines, entry)
+        if self._entry_deadlines[0] is not entry:
+            return
+
+        _LOGGER.info("Entry delay shortened to %s seconds by sensor %s", delay, entity_id)
+        self._move_timer(deadline, delay)
+        self._async_write_state()
+        self._record_event(EVENT_ALARM_PENDING, {"sensor": entity_id, "delay": delay})
+
+    @callback
+    def _confirm_opening(self, entity_id: str) -> bool:
+        """Return True when an opening may start the entry delay.
+
+        In the confirmation modes, the entry delay only starts once
+        confirmation_count distinct sensors opened within
+        confirmation_window seconds, or at once for a sensor listed in
+        skip_confirmation_sensors. A sensor with an entry delay of 0 still
+        waits for the confirmation. The openings are kept in time order: the
+        expired ones are dropped from the head, without going through the
+        whole window.
+        """
+        if (
+            self._confirmation_count <= 1
+            or self._state not in self._confirmation_modes
+            or entity_id in self._skip_confirmation_sensors
+        ):
+            return True
+
+        now = self.hass.loop.time()
+        events = self._confirmation_events
+        counts = self._confirmation_counts
+        oldest = now - self._confirmation_window
+        while events and events[0][0] < oldest:
+            _, sensor = events.popleft()
+            if counts[sensor] == 1:
+                del counts[sensor]
+            else:
+                counts[sensor] -= 1
+
+        events.append((now, entity_id))
+        counts[entity_id] = counts.get(entity_id, 0) + 1
+        if len(counts) < self._confirmation_count:
+            _LOGGER.info(
+                "Sensor %s opened, waiting for confirmation (%s/%s sensors)",
+                entity_id,
+                len(counts),
+                self._confirmation_count,
+            )
+            return False
+
+        self._reset_confirmation()
+        return True
+
+    @callback
+    def _reset_confirmation(self) -> None:
+        """Forget the openings waiting for confirmation."""
+        self._confirmation_events.clear()
+        self._confirmation_counts.clear()
 
     @callback
     def _trigger_alarm(self, now: datetime):
         """Trigger the alarm."""
-        self._timer_handle = None
         _LOGGER.warning("Alarm triggered!")
+        # Capteur dont l'echeance d'entree a declenche l'alarme
+        if self._entry_deadlines:
+            entry_sensor = self._entry_deadlines[0][2]
+        else:
+            entry_sensor = self._last_triggered_by
         self._state = AlarmControlPanelState.TRIGGERED
         self._triggered_count += 1
         self._last_changed_at = dt_util.utcnow()
-        self.async_write_ha_state()
+        self._start_timer(TIMER_PHASE_TRIGGER, self._post_trigger_action)
+        self._async_write_state()
         
+        self._record_event(
+            EVENT_ALARM_TRIGGERED,
+            {"sensor": self._last_triggered_by, ATTR_ENTRY_SENSOR: entry_sensor},
+        )
         self.hass.bus.async_fire(
-            f"{DOMAIN}.triggered",
+            EVENT_ALARM_TRIGGERED,
             {
                 "entity_id": self.entity_id,
                 "triggered_by": self._last_triggered_by,
                 "timestamp": self._last_changed_at.isoformat(),
             },
         )
-        
-        self._timer_handle = async_call_later(self.hass, self._trigger_time, self._post_trigger_action)
 
     @callback
     def _post_trigger_action(self, now: datetime):
         """Action after trigger duration."""
-        self._timer_handle = None
         if self._rearm_after_trigger and self._last_armed_state:
             _LOGGER.info("Rearming alarm to %s", self._last_armed_state)
             self._state = self._last_armed_state
+            self._reset_confirmation()
+            self._record_event(EVENT_ALARM_ARMED, {"mode": self._state})
         else:
             _LOGGER.info("Disarming alarm after trigger.")
+            self._record_event(EVENT_ALARM_DISARMED, {"from_state": self._state})
             self._state = AlarmControlPanelState.DISARMED
         self._last_changed_at = dt_util.utcnow()
-        self.async_write_ha_state()
+        self._async_write_state()
 
     async def async_alarm_disarm(self, code: str | None = None) -> None:
         """Send disarm command."""
-        await self._perform_disarm(code)
+        self._perform_disarm(code, user_id=self._service_user_id())
 
     def _validate_disarm_code(self, code: str | None) -> tuple[bool, bool]:
         """Validate disarm code.
@@ -374,15 +1115,23 @@ class AlarmePersonnaliseeEntity(AlarmControlPanelEntity):
 
         return True, False
 
-    async def _perform_disarm(
-        self, code: str | None = None, validation: tuple[bool, bool] | None = None
+    @callback
+    def _perform_disarm(
+        self,
+        code: str | None = None,
+        validation: tuple[bool, bool] | None = None,
+        user_id: str | None = None,
     ) -> None:
         """Handle disarm logic with validation.
 
+        Synchronous so that badge scans disarm from their state-change
+        callback without scheduling a task.
+
         Args:
             code: The provided code to validate.
             validation: Optional pre-validated (is_valid, is_emergency) tuple
                 to avoid re-validation when already performed by caller.
+            user_id: The user asking for the disarm, recorded in the journal.
         """
         if self._state == AlarmControlPanelState.DISARMED:
             _LOGGER.info("Alarm is already disarmed. Ignoring disarm request.")
@@ -397,15 +1146,20 @@ class AlarmePersonnaliseeEntity(AlarmControlPanelEntity):
 
         if is_emergency:
             _LOGGER.warning("Emergency code used to disarm alarm!")
-            self.hass.bus.async_fire(f"{DOMAIN}.urgence", {"entity_id": self.entity_id})
+            self._record_event(EVENT_EMERGENCY_DISARM, {"user_id": user_id})
+            self.hass.bus.async_fire(EVENT_EMERGENCY_DISARM, {"entity_id": self.entity_id})
 
         _LOGGER.info("Alarm disarmed from state: %s", self._state)
+        self._record_event(
+            EVENT_ALARM_DISARMED, {"from_state": self._state, "user_id": user_id}
+        )
         self._state = AlarmControlPanelState.DISARMED
         self._last_armed_state = None
         self._last_triggered_by = None
+        self._last_triggered_by_name = None
         self._last_changed_at = dt_util.utcnow()
         self._cancel_timer()
-        self.async_write_ha_state()
+        self._async_write_state()
 
     async def _arm(self, state: AlarmControlPanelState, code: str | None = None):
         """Arm the alarm to the specified state - IDEMPOTENT.
@@ -421,6 +1175,7 @@ class AlarmePersonnaliseeEntity(AlarmControlPanelEntity):
             - Ignores if already in the requested state (idempotent)
             - Prevents arming while in ARMING, PENDING, or TRIGGERED states
             - Validates code if required
+            - Refuses when sensors of the mode are open, if configured
         """
         # Check if already armed in the requested state - IDEMPOTENT
         if self._state == state:
@@ -450,20 +1205,50 @@ class AlarmePersonnaliseeEntity(AlarmControlPanelEntity):
                 _LOGGER.warning("Invalid code provided for arming.")
                 return
 
+        # Capteurs deja ouverts : ensemble tenu a jour, aucun parcours des etats
+        open_sensors = self._sensors_by_status[_SENSOR_OPEN].get(state)
+        if open_sensors and self._block_arming_if_open:
+            _LOGGER.warning(
+                "Arming to %s refused: open sensors %s", state, ", ".join(sorted(open_sensors))
+            )
+            self._record_event(
+                EVENT_ARMING_REFUSED, {"mode": state, "open_sensors": sorted(open_sensors)}
+            )
+            self.hass.bus.async_fire(
+                EVENT_ARMING_REFUSED,
+                {
+                    "entity_id": self.entity_id,
+                    "mode": state,
+                    "open_sensors": sorted(open_sensors),
+                },
+            )
+            return
+
         self._cancel_timer()
         self._last_armed_state = state
+        self._arming_user_id = self._service_user_id()
         _LOGGER.info("Alarm arming to %s in %s seconds", state, self._arming_time)
         self._state = AlarmControlPanelState.ARMING
-        self.async_write_ha_state()
-        self._timer_handle = async_call_later(self.hass, self._arming_time, self._finish_arming)
+        self._start_timer(TIMER_PHASE_ARMING, self._finish_arming)
+        self._async_write_state()
 
     @callback
     def _finish_arming(self, now: datetime):
-        self._timer_handle = None
         _LOGGER.info("Alarm armed to %s", self._last_armed_state)
         self._state = self._last_armed_state
+        self._reset_confirmation()
         self._last_changed_at = dt_util.utcnow()
-        self.async_write_ha_state()
+        self._async_write_state()
+        # Capteurs ouverts a l'armement : ignores jusqu'a leur prochaine ouverture
+        bypassed = self._sensors_by_status[_SENSOR_OPEN].get(self._state)
+        self._record_event(
+            EVENT_ALARM_ARMED,
+            {
+                "mode": self._state,
+                "user_id": self._arming_user_id,
+                "bypassed_sensors": sorted(bypassed) if bypassed else [],
+            },
+        )
 
     async def async_alarm_arm_home(self, code: str | None = None) -> None:
         """Send arm home command."""
@@ -4,10 +4,12 @@ from __future__ import annotations
 import logging
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
+from .data import async_get_domain_data
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,13 +20,16 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up button entities."""
-    async_add_entities([ResetTriggerCountButton(hass, entry)])
+    async_add_entities(
+        [ResetTriggerCountButton(hass, entry), ResetStatisticsButton(hass, entry)]
+    )
 
 
 class ResetTriggerCountButton(ButtonEntity):
     """Button to reset the trigger count."""
 
     _attr_has_entity_name = True
+    _attr_should_poll = False
     _attr_icon = "mdi:counter"
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -42,12 +47,39 @@ class ResetTriggerCountButton(ButtonEntity):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        # Trouver l'entite alarme
-        for entry_id, entity in self.hass.data.get(DOMAIN, {}).items():
-            if hasattr(entity, '_triggered_count'):
-                entity._triggered_count = 0
-                entity.async_write_ha_state()
-                _LOGGER.info("Trigger count reset via button")
-                return
-        
-        _LOGGER.warning("Could not find alarm entity to reset trigger count")
+        # Trouver l'entite alarme de cette entree
+        alarm = async_get_domain_data(self.hass).async_get_entry_alarm(self._entry.entry_id)
+        if alarm is None:
+            _LOGGER.warning("Could not find alarm entity to reset trigger count")
+            return
+
+        alarm.async_reset_trigger_count()
+        _LOGGER.info("Trigger count reset via button")
+
+
+class ResetStatisticsButton(ButtonEntity):
+    """Button to reset the hot path statistics."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_icon = "mdi:chart-timeline-variant"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the button."""
+        self.hass = hass
+        self._entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_reset_statistics"
+        self._attr_name = "Reinitialiser les statistiques"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": "Alarme Personnalisee",
+            "manufacturer": "Custom",
+            "model": "Alarme Personnalisee",
+        }
+
+    async def async_press(self) -> None:
+        """Handle the button press."""
+        async_get_domain_data(self.hass).entries[self._entry.entry_id].stats.reset()
+        _LOGGER.info("Statistics reset via button")
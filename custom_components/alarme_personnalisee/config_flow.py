@@ -1,15 +1,42 @@
 """Config flow for Alarme Personnalisée integration."""
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.core import callback
-from homeassistant.helpers import selector
+from homeassistant.helpers import config_validation as cv, selector
 
-from .const import DOMAIN, CONF_BADGES, CONF_BADGE_NAME, CONF_BADGE_ENTITY
+from .const import (
+    DOMAIN,
+    CONF_BADGES,
+    CONF_BADGE_NAME,
+    CONF_BADGE_ENTITY,
+    CONF_BLOCK_ARMING_IF_OPEN,
+    CONF_CHATTER_MAX_EVENTS,
+    CONF_CHATTER_WINDOW,
+    CONF_CONFIRMATION_COUNT,
+    CONF_CONFIRMATION_MODES,
+    CONF_CONFIRMATION_WINDOW,
+    CONF_FOLLOWER_SENSORS,
+    CONF_SKIP_CONFIRMATION_SENSORS,
+    CONF_MIN_ON_TIME,
+    CONF_SENSOR_DELAYS,
+    DEFAULT_CHATTER_MAX_EVENTS,
+    DEFAULT_CHATTER_WINDOW,
+    DEFAULT_CONFIRMATION_COUNT,
+    DEFAULT_CONFIRMATION_MODES,
+    DEFAULT_CONFIRMATION_WINDOW,
+    DEFAULT_MIN_ON_TIME,
+)
+
+# Delais d'entree propres a certains capteurs : {entity_id: secondes}
+SENSOR_DELAYS_SCHEMA = vol.Schema(
+    {cv.entity_id: vol.All(vol.Coerce(float), vol.Range(min=0))}
+)
 
 
 class AlarmePersonnaliseeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -42,6 +69,13 @@ class AlarmePersonnaliseeOptionsFlow(config_entries.OptionsFlow):
         """Initialize options flow."""
         self._config_entry = config_entry
 
+    @property
+    def _options(self) -> Mapping[str, Any]:
+        """Return the options, with the changes not stored yet by the entities."""
+        domain_data = self.hass.data.get(DOMAIN)
+        entry_data = domain_data.entries.get(self._config_entry.entry_id) if domain_data else None
+        return entry_data.options if entry_data else self._config_entry.options
+
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> config_entries.FlowResult:
@@ -57,10 +91,10 @@ class AlarmePersonnaliseeOptionsFlow(config_entries.OptionsFlow):
         """Manage general options."""
         if user_input is not None:
             # Merge with existing options
-            new_options = {**self._config_entry.options, **user_input}
+            new_options = {**self._options, **user_input}
             return self.async_create_entry(title="", data=new_options)
 
-        options = self._config_entry.options
+        options = self._options
         data_schema = vol.Schema(
             {
                 vol.Optional("code", default=options.get("code", "")): str,
@@ -87,6 +121,10 @@ class AlarmePersonnaliseeOptionsFlow(config_entries.OptionsFlow):
                     "rearm_after_trigger",
                     default=options.get("rearm_after_trigger", False),
                 ): bool,
+                vol.Optional(
+                    CONF_BLOCK_ARMING_IF_OPEN,
+                    default=options.get(CONF_BLOCK_ARMING_IF_OPEN, False),
+                ): bool,
             }
         )
 
@@ -96,12 +134,20 @@ class AlarmePersonnaliseeOptionsFlow(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> config_entries.FlowResult:
         """Manage sensor options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            # Merge with existing options
-            new_options = {**self._config_entry.options, **user_input}
-            return self.async_create_entry(title="", data=new_options)
+            try:
+                user_input[CONF_SENSOR_DELAYS] = SENSOR_DELAYS_SCHEMA(
+                    user_input.get(CONF_SENSOR_DELAYS) or {}
+                )
+            except vol.Invalid:
+                errors[CONF_SENSOR_DELAYS] = "invalid_sensor_delays"
+            else:
+                # Merge with existing options
+                new_options = {**self._options, **user_input}
+                return self.async_create_entry(title="", data=new_options)
 
-        options = self._config_entry.options
+        options = self._options
         data_schema = vol.Schema(
             {
                 vol.Optional(
@@ -119,10 +165,58 @@ class AlarmePersonnaliseeOptionsFlow(config_entries.OptionsFlow):
                 ): selector.EntitySelector(
                     selector.EntitySelectorConfig(domain="binary_sensor", multiple=True)
                 ),
+                vol.Optional(
+                    CONF_MIN_ON_TIME,
+                    default=options.get(CONF_MIN_ON_TIME, DEFAULT_MIN_ON_TIME),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_CHATTER_MAX_EVENTS,
+                    default=options.get(CONF_CHATTER_MAX_EVENTS, DEFAULT_CHATTER_MAX_EVENTS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_CHATTER_WINDOW,
+                    default=options.get(CONF_CHATTER_WINDOW, DEFAULT_CHATTER_WINDOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_CONFIRMATION_COUNT,
+                    default=options.get(CONF_CONFIRMATION_COUNT, DEFAULT_CONFIRMATION_COUNT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_CONFIRMATION_WINDOW,
+                    default=options.get(CONF_CONFIRMATION_WINDOW, DEFAULT_CONFIRMATION_WINDOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_CONFIRMATION_MODES,
+                    default=options.get(CONF_CONFIRMATION_MODES, DEFAULT_CONFIRMATION_MODES),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=["armed_home", "armed_away", "armed_vacation"],
+                        multiple=True,
+                        translation_key=CONF_CONFIRMATION_MODES,
+                    )
+                ),
+                # Un delai d'entree a 0 ne dispense pas de la confirmation :
+                # seuls ces capteurs la sautent
+                vol.Optional(
+                    CONF_SKIP_CONFIRMATION_SENSORS,
+                    default=options.get(CONF_SKIP_CONFIRMATION_SENSORS, []),
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain="binary_sensor", multiple=True)
+                ),
+                vol.Optional(
+                    CONF_SENSOR_DELAYS, default=options.get(CONF_SENSOR_DELAYS, {})
+                ): selector.ObjectSelector(),
+                vol.Optional(
+                    CONF_FOLLOWER_SENSORS, default=options.get(CONF_FOLLOWER_SENSORS, [])
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain="binary_sensor", multiple=True)
+                ),
             }
         )
 
-        return self.async_show_form(step_id="sensors", data_schema=data_schema)
+        return self.async_show_form(
+            step_id="sensors", data_schema=data_schema, errors=errors
+        )
 
     async def async_step_badges(
         self, user_input: dict[str, Any] | None = None
@@ -134,9 +228,9 @@ class AlarmePersonnaliseeOptionsFlow(config_entries.OptionsFlow):
             elif user_input.get("action") == "remove":
                 return await self.async_step_remove_badge()
             else:
-                return self.async_create_entry(title="", data=self._config_entry.options)
+                return self.async_create_entry(title="", data=self._options)
 
-        badges = self._config_entry.options.get(CONF_BADGES, [])
+        badges = self._options.get(CONF_BADGES, [])
         
         description = "Badges configures :\n"
         if badges:
@@ -166,14 +260,14 @@ class AlarmePersonnaliseeOptionsFlow(config_entries.OptionsFlow):
     ) -> config_entries.FlowResult:
         """Add a new badge."""
         if user_input is not None:
-            badges = self._config_entry.options.get(CONF_BADGES, [])
-            badges.append(
+            badges = [
+                *self._options.get(CONF_BADGES, []),
                 {
                     CONF_BADGE_NAME: user_input[CONF_BADGE_NAME],
                     CONF_BADGE_ENTITY: user_input[CONF_BADGE_ENTITY],
-                }
-            )
-            new_options = {**self._config_entry.options, CONF_BADGES: badges}
+                },
+            ]
+            new_options = {**self._options, CONF_BADGES: badges}
             self.hass.config_entries.async_update_entry(
                 self._config_entry, options=new_options
             )
@@ -195,7 +289,7 @@ class AlarmePersonnaliseeOptionsFlow(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> config_entries.FlowResult:
         """Remove a badge."""
-        badges = self._config_entry.options.get(CONF_BADGES, [])
+        badges = self._options.get(CONF_BADGES, [])
         
         if not badges:
             return await self.async_step_badges()
@@ -203,7 +297,7 @@ class AlarmePersonnaliseeOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             badge_to_remove = user_input["badge_to_remove"]
             badges = [b for b in badges if f"{b[CONF_BADGE_NAME]} ({b[CONF_BADGE_ENTITY]})" != badge_to_remove]
-            new_options = {**self._config_entry.options, CONF_BADGES: badges}
+            new_options = {**self._options, CONF_BADGES: badges}
             self.hass.config_entries.async_update_entry(
                 self._config_entry, options=new_options
             )
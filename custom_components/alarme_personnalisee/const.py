@@ -7,14 +7,32 @@ EVENT_EMERGENCY_DISARM = f"{DOMAIN}.urgence"
 EVENT_ALARM_TRIGGERED = f"{DOMAIN}.triggered"
 EVENT_ALARM_ARMED = f"{DOMAIN}.armed"
 EVENT_ALARM_DISARMED = f"{DOMAIN}.disarmed"
+EVENT_ALARM_PENDING = f"{DOMAIN}.pending"
 EVENT_ARMING_CANCELLED = f"{DOMAIN}.arming_cancelled"
+EVENT_ARMING_REFUSED = f"{DOMAIN}.arming_refused"
 EVENT_BADGE_DISARM = f"{DOMAIN}.badge_disarm"
 
+# Dispatcher signals (formatted with the config entry id)
+SIGNAL_ALARM_UPDATED = f"{DOMAIN}_alarm_updated_{{}}"
+SIGNAL_OPTIONS_UPDATED = f"{DOMAIN}_options_updated_{{}}"
+SIGNAL_SENSORS_UPDATED = f"{DOMAIN}_sensors_updated_{{}}"
+
+# Timer phases
+TIMER_PHASE_ARMING = "arming"
+TIMER_PHASE_ENTRY = "entry"
+TIMER_PHASE_TRIGGER = "trigger"
+
 # Default values
 DEFAULT_ARMING_TIME = 30
 DEFAULT_DELAY_TIME = 30
 DEFAULT_TRIGGER_TIME = 180
 DEFAULT_CODE = ""
+DEFAULT_MIN_ON_TIME = 0
+DEFAULT_CHATTER_MAX_EVENTS = 0
+DEFAULT_CHATTER_WINDOW = 60
+DEFAULT_CONFIRMATION_COUNT = 1
+DEFAULT_CONFIRMATION_WINDOW = 60
+DEFAULT_CONFIRMATION_MODES = ["armed_vacation"]
 
 # Attribute keys
 ATTR_TRIGGERED_BY = "triggered_by"
@@ -25,8 +43,26 @@ ATTR_LAST_ARMED_STATE = "last_armed_state"
 ATTR_MONITORED_SENSORS = "monitored_sensors"
 ATTR_BADGE_NAME = "badge_name"
 ATTR_BADGE_ENTITY = "badge_entity"
+ATTR_TIMER_PHASE = "timer_phase"
+ATTR_TIMER_DEADLINE = "timer_deadline"
+ATTR_OPEN_SENSORS = "open_sensors"
+ATTR_UNAVAILABLE_SENSORS = "unavailable_sensors"
+ATTR_READY_TO_ARM = "ready_to_arm"
+ATTR_CHATTERING_SENSORS = "chattering_sensors"
+ATTR_SUPPRESSED_EVENTS = "suppressed_events"
+ATTR_ENTRY_SENSOR = "entry_sensor"
 
 # Configuration keys
 CONF_BADGES = "badges"
 CONF_BADGE_NAME = "badge_name"
 CONF_BADGE_ENTITY = "badge_entity"
+CONF_BLOCK_ARMING_IF_OPEN = "block_arming_if_open"
+CONF_MIN_ON_TIME = "sensor_min_on_time"
+CONF_CHATTER_MAX_EVENTS = "chatter_max_events"
+CONF_CHATTER_WINDOW = "chatter_window"
+CONF_CONFIRMATION_COUNT = "confirmation_count"
+CONF_CONFIRMATION_WINDOW = "confirmation_window"
+CONF_CONFIRMATION_MODES = "confirmation_modes"
+CONF_SKIP_CONFIRMATION_SENSORS = "skip_confirmation_sensors"
+CONF_SENSOR_DELAYS = "sensor_delays"
+CONF_FOLLOWER_SENSORS = "follower_sensors"
@@ -0,0 +1,76 @@
+"""Runtime data for the Alarme Personnalisee integration."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .journal import EventJournal
+from .multiplexer import SensorMultiplexer
+from .options import OptionsWriter
+from .scheduler import DeadlineScheduler
+from .stats import AlarmStats
+
+if TYPE_CHECKING:
+    from .alarm_control_panel import AlarmePersonnaliseeEntity
+
+
+class AlarmeEntryData:
+    """Runtime data of one config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the entry data."""
+        self.entry = entry
+        self.alarm: AlarmePersonnaliseeEntity | None = None
+        self.options_writer = OptionsWriter(hass, entry)
+        self.stats = AlarmStats()
+
+    @property
+    def options(self) -> Mapping[str, Any]:
+        """Return the current options, including changes not stored yet."""
+        return self.options_writer.options
+
+
+class AlarmeDomainData:
+    """Runtime data shared by all config entries."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the domain data."""
+        self.sensors = SensorMultiplexer(hass)
+        self.scheduler = DeadlineScheduler(hass)
+        self.journal = EventJournal(hass)
+        self.entries: dict[str, AlarmeEntryData] = {}
+        self._alarms_by_entity_id: dict[str, AlarmePersonnaliseeEntity] = {}
+
+    @callback
+    def async_get_alarm(self, entity_id: str) -> AlarmePersonnaliseeEntity | None:
+        """Return the alarm entity with this entity_id."""
+        return self._alarms_by_entity_id.get(entity_id)
+
+    @callback
+    def async_get_entry_alarm(self, entry_id: str) -> AlarmePersonnaliseeEntity | None:
+        """Return the alarm entity of a config entry."""
+        entry_data = self.entries.get(entry_id)
+        return entry_data.alarm if entry_data else None
+
+    @callback
+    def async_register_alarm(self, alarm: AlarmePersonnaliseeEntity) -> None:
+        """Index an alarm entity by its entity_id once it is added to hass."""
+        self._alarms_by_entity_id[alarm.entity_id] = alarm
+
+    @callback
+    def async_unregister_alarm(self, alarm: AlarmePersonnaliseeEntity) -> None:
+        """Remove an alarm entity from the index."""
+        if self._alarms_by_entity_id.get(alarm.entity_id) is alarm:
+            del self._alarms_by_entity_id[alarm.entity_id]
+
+
+@callback
+def async_get_domain_data(hass: HomeAssistant) -> AlarmeDomainData:
+    """Return the integration runtime data, creating it on first use."""
+    if (domain_data := hass.data.get(DOMAIN)) is None:
+        domain_data = hass.data[DOMAIN] = AlarmeDomainData(hass)
+    return domain_data
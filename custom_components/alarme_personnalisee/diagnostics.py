@@ -0,0 +1,50 @@
+"""Diagnostics support for Alarme Personnalisee."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .data import async_get_domain_data
+
+TO_REDACT = {"code", "emergency_code"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Everything comes from the indexes and counters kept by the integration:
+    nothing walks the state machine.
+    """
+    domain_data = async_get_domain_data(hass)
+    entry_data = domain_data.entries[entry.entry_id]
+    alarm = entry_data.alarm
+    scheduler = domain_data.scheduler
+
+    return {
+        "data": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": async_redact_data(dict(entry_data.options), TO_REDACT),
+        "alarm": alarm.diagnostics() if alarm is not None and alarm.hass else None,
+        "statistics": entry_data.stats.as_dict(),
+        # Structures partagees par toutes les entrees
+        "shared": {
+            "entries": len(domain_data.entries),
+            "sensor_subscriptions": domain_data.sensors.subscription_count,
+            "scheduler": {
+                "pending": scheduler.pending_count,
+                "has_timer": scheduler.has_timer,
+                "fired": scheduler.fired_count,
+                "drift_max": scheduler.drift_max,
+                "drift_mean": (
+                    scheduler.drift_total / scheduler.fired_count
+                    if scheduler.fired_count
+                    else None
+                ),
+            },
+            "journal_events": len(domain_data.journal),
+        },
+    }
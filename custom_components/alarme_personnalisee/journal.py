@@ -0,0 +1,182 @@
+"""Alarm event journal for Alarme Personnalisee."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from itertools import islice
+from operator import itemgetter
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.journal"
+
+# Nombre d'evenements conserves (toutes alarmes confondues) et duree de retention
+JOURNAL_SIZE = 5000
+JOURNAL_MAX_AGE = timedelta(days=30)
+
+# Ecriture groupee : au plus tard apres ce delai, ou des que ce nombre
+# d'evenements attend d'etre enregistre
+JOURNAL_SAVE_DELAY = 10
+JOURNAL_SAVE_BATCH = 100
+
+_event_id = itemgetter("id")
+
+
+def _event_time(event: dict[str, Any]) -> datetime:
+    """Return the time of an event, whatever the UTC offset it was stored with."""
+    return datetime.fromisoformat(event["timestamp"])
+
+
+class EventJournal:
+    """Persistent journal of the events of all alarm entities.
+
+    Events are kept in memory, in time order, in a bounded buffer: queries
+    never touch the disk nor the recorder. The buffer is stored with a
+    Store whose writes are grouped (JOURNAL_SAVE_DELAY / JOURNAL_SAVE_BATCH)
+    and done in the executor. Events older than JOURNAL_MAX_AGE, or beyond
+    JOURNAL_SIZE, are dropped.
+
+    Each event gets an increasing id used as a pagination cursor: a query
+    returns the newest events older than the given cursor.
+    """
+
+    def __init__(self, hass: HomeAssistant, maxlen: int = JOURNAL_SIZE) -> None:
+        """Initialize the journal."""
+        self.hass = hass
+        self._events: deque[dict[str, Any]] = deque(maxlen=maxlen)
+        self._next_id = 1
+        self._unsaved = 0
+        self._loaded = False
+        self._listeners: list[Callable[[dict[str, Any]], None]] = []
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+
+    def __len__(self) -> int:
+        """Return the number of events kept."""
+        return len(self._events)
+
+    async def async_load(self) -> None:
+        """Load the stored events, once."""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        if (data := await self._store.async_load()) is None:
+            return
+
+        # Evenements deja enregistres avant le chargement : les garder apres
+        recorded = list(self._events)
+        self._events.clear()
+        self._events.extend(data.get("events", []))
+        self._compact()
+        if self._events:
+            self._next_id = max(self._next_id, self._events[-1]["id"] + 1)
+        for event in recorded:
+            event["id"] = self._next_id
+            self._next_id += 1
+            self._events.append(event)
+
+    @callback
+    def async_add_listener(
+        self, listener: Callable[[dict[str, Any]], None]
+    ) -> CALLBACK_TYPE:
+        """Call listener with each new event; return a function removing it."""
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def async_record(
+        self, entity_id: str, event_type: str, data: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Append an event, schedule its storage and return it."""
+        event = {
+            "id": self._next_id,
+            "timestamp": dt_util.utcnow().isoformat(),
+            "entity_id": entity_id,
+            "event_type": event_type,
+            **(data or {}),
+        }
+        self._next_id += 1
+        self._events.append(event)
+        for listener in tuple(self._listeners):
+            listener(event)
+
+        # async_delay_save repousse l'ecriture a chaque appel : ne la programmer
+        # qu'au premier evenement non enregistre, puis a l'atteinte du seuil
+        self._unsaved += 1
+        if self._unsaved == 1:
+            self._store.async_delay_save(self._data_to_save, JOURNAL_SAVE_DELAY)
+        elif self._unsaved == JOURNAL_SAVE_BATCH:
+            self._store.async_delay_save(self._data_to_save, 0)
+        return event
+
+    @callback
+    def async_query(
+        self,
+        entity_id: str | None = None,
+        before: int | None = None,
+        limit: int = 50,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """Return the newest matching events older than the cursor.
+
+        start_time (inclusive) and end_time (exclusive) restrict the events
+        to a time range; the range and the cursor are found by bisection on
+        the event times and ids. Also returns the next cursor, None when
+        there is nothing older to fetch.
+        """
+        events = self._events
+        if not events:
+            return [], None
+
+        start = 0
+        end = len(events)
+        if start_time is not None:
+            start = bisect_left(events, dt_util.as_utc(start_time), key=_event_time)
+        if end_time is not None:
+            end = bisect_left(events, dt_util.as_utc(end_time), key=_event_time)
+        # Les ids sont croissants, sans etre forcement consecutifs
+        if before is not None:
+            end = min(end, bisect_left(events, before, key=_event_id))
+
+        result = []
+        for event in islice(reversed(events), len(events) - end, len(events) - start):
+            if entity_id is None or event["entity_id"] == entity_id:
+                result.append(event)
+                if len(result) == limit:
+                    break
+
+        next_cursor = result[-1]["id"] if len(result) == limit else None
+        return result, next_cursor
+
+    async def async_flush(self) -> None:
+        """Store the events not written yet right away."""
+        if self._unsaved:
+            await self._store.async_save(self._data_to_save())
+
+    def _compact(self) -> None:
+        """Drop the events older than the retention period."""
+        oldest = dt_util.utcnow() - JOURNAL_MAX_AGE
+        events = self._events
+        while events and _event_time(events[0]) < oldest:
+            events.popleft()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store (called just before the write)."""
+        self._unsaved = 0
+        self._compact()
+        return {"events": list(self._events)}
@@ -0,0 +1,72 @@
+"""Shared sensor subscriptions for Alarme Personnalisee partitions."""
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+
+class SensorMultiplexer:
+    """Hold one state subscription per sensor for all alarm partitions.
+
+    Each partition (config entry) declares the sensors of all its modes. The
+    multiplexer keeps an inverted index sensor -> partitions and dispatches
+    each state change only to the partitions listed for that sensor.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the multiplexer."""
+        self.hass = hass
+        self._interests: dict[str, frozenset[str]] = {}
+        self._listeners: dict[str, dict[str, Callable[[Event], None]]] = {}
+        self._unsubs: dict[str, CALLBACK_TYPE] = {}
+
+    @property
+    def subscription_count(self) -> int:
+        """Return the number of sensors currently subscribed."""
+        return len(self._unsubs)
+
+    @callback
+    def async_set_interest(
+        self,
+        partition: str,
+        sensors: frozenset[str],
+        action: Callable[[Event], None] | None,
+    ) -> None:
+        """Replace the sensors a partition listens to.
+
+        Only the difference with the previous set is (un)subscribed, so a
+        sensor shared by several partitions keeps its single subscription.
+        """
+        old_sensors = self._interests.get(partition, frozenset())
+
+        for sensor in old_sensors - sensors:
+            listeners = self._listeners[sensor]
+            del listeners[partition]
+            if not listeners:
+                del self._listeners[sensor]
+                self._unsubs.pop(sensor)()
+
+        for sensor in sensors - old_sensors:
+            if (listeners := self._listeners.get(sensor)) is None:
+                listeners = self._listeners[sensor] = {}
+                self._unsubs[sensor] = async_track_state_change_event(
+                    self.hass, sensor, self._async_sensor_changed
+                )
+            listeners[partition] = action
+
+        if sensors:
+            self._interests[partition] = sensors
+        else:
+            self._interests.pop(partition, None)
+
+    @callback
+    def _async_sensor_changed(self, event: Event) -> None:
+        """Dispatch a sensor state change to the interested partitions."""
+        listeners = self._listeners.get(event.data["entity_id"])
+        if not listeners:
+            return
+        # Copie : un listener peut modifier les abonnements (ex. desarmement)
+        for action in tuple(listeners.values()):
+            action(event)
@@ -4,10 +4,12 @@ from __future__ import annotations
 import logging
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_OPTIONS_UPDATED
+from .data import async_get_domain_data
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,11 +36,14 @@ class AlarmTimeNumber(NumberEntity):
     _attr_native_min_value = 0
     _attr_native_max_value = 600
     _attr_native_step = 5
+    # Valeur tenue a jour par le signal des options : inutile de l'interroger
+    _attr_should_poll = False
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry, config_key: str, name: str, icon: str) -> None:
         """Initialize the number entity."""
         self.hass = hass
         self._entry = entry
+        self._entry_data = async_get_domain_data(hass).entries[entry.entry_id]
         self._config_key = config_key
         self._attr_unique_id = f"{entry.entry_id}_{config_key}"
         self._attr_name = name
@@ -53,19 +58,32 @@ class AlarmTimeNumber(NumberEntity):
 
     def _update_value(self) -> None:
         """Update value from config entry options."""
-        self._attr_native_value = self._entry.options.get(self._config_key, 30)
+        self._attr_native_value = self._entry_data.options.get(self._config_key, 30)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the option changes made elsewhere."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_OPTIONS_UPDATED.format(self._entry.entry_id),
+                self._async_options_changed,
+            )
+        )
 
-    @property
-    def native_value(self) -> float:
-        """Return the current value."""
-        return self._entry.options.get(self._config_key, 30)
+    @callback
+    def _async_options_changed(self) -> None:
+        """Write the state when the option changed."""
+        old_value = self._attr_native_value
+        self._update_value()
+        if self._attr_native_value != old_value:
+            self.async_write_ha_state()
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the value."""
-        new_options = {**self._entry.options, self._config_key: int(value)}
-        self.hass.config_entries.async_update_entry(self._entry, options=new_options)
-        self._attr_native_value = int(value)
-        self.async_write_ha_state()
+        # Applique tout de suite, enregistre de facon groupee ; l'etat est ecrit
+        # par _async_options_changed, appele par le signal des options
+        self._entry_data.options_writer.async_set(self._config_key, int(value))
         _LOGGER.info("Updated %s to %s seconds", self._config_key, int(value))
 
 
@@ -0,0 +1,91 @@
+"""Batched option updates for Alarme Personnalisee."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import SIGNAL_OPTIONS_UPDATED
+
+_LOGGER = logging.getLogger(__name__)
+
+# Delai de regroupement des ecritures de la config entry (secondes)
+OPTIONS_WRITE_DELAY = 2
+
+
+class OptionsWriter:
+    """Apply option changes in memory at once and persist them as one update.
+
+    Number and switch entities change options one value at a time (a slider
+    drag, a script setting the three delays...). Each change is visible right
+    away through ``options`` and SIGNAL_OPTIONS_UPDATED, and all the changes
+    made within OPTIONS_WRITE_DELAY are stored with a single
+    ``async_update_entry``. A pending change is dropped when the options flow
+    stores another value for the same option before the flush.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the writer."""
+        self.hass = hass
+        self._entry = entry
+        self._pending: dict[str, Any] = {}
+        # Options telles que stockees lors de la derniere mise a jour connue
+        self._stored: Mapping[str, Any] = entry.options
+        self._debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=OPTIONS_WRITE_DELAY,
+            immediate=False,
+            function=self.async_flush,
+        )
+
+    @property
+    def options(self) -> Mapping[str, Any]:
+        """Return the stored options with the pending changes applied."""
+        if not self._pending:
+            return self._entry.options
+        return {**self._entry.options, **self._pending}
+
+    @callback
+    def async_set(self, key: str, value: Any) -> None:
+        """Change an option now and schedule its storage."""
+        if self.options.get(key) == value:
+            return
+
+        self._pending[key] = value
+        async_dispatcher_send(self.hass, SIGNAL_OPTIONS_UPDATED.format(self._entry.entry_id))
+        self._debouncer.async_schedule_call()
+
+    @callback
+    def async_flush(self) -> None:
+        """Store the pending changes in the config entry."""
+        if not self._pending:
+            return
+
+        options = {**self._entry.options, **self._pending}
+        self._pending = {}
+        self.hass.config_entries.async_update_entry(self._entry, options=options)
+        self._stored = self._entry.options
+
+    @callback
+    def async_entry_updated(self) -> None:
+        """Drop the pending changes of the options stored by someone else."""
+        options = self._entry.options
+        for key in [
+            key for key in self._pending if options.get(key) != self._stored.get(key)
+        ]:
+            del self._pending[key]
+        self._stored = options
+        if not self._pending:
+            self._debouncer.async_cancel()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Store the pending changes and stop the debouncer."""
+        self._debouncer.async_shutdown()
+        self.async_flush()
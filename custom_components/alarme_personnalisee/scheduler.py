@@ -0,0 +1,141 @@
+"""Shared deadline scheduler for Alarme Personnalisee partitions."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime
+from heapq import heapify, heappop, heappush
+from itertools import count
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+# En dessous de cette taille, les appels annules ne sont retires qu'en tete de tas
+_COMPACT_MIN_SIZE = 64
+
+
+class ScheduledCall:
+    """A deadline registered in the scheduler."""
+
+    __slots__ = ("_scheduler", "when", "_seq", "action", "cancelled")
+
+    def __init__(
+        self,
+        scheduler: DeadlineScheduler,
+        when: float,
+        seq: int,
+        action: Callable[[datetime], None],
+    ) -> None:
+        """Initialize the call."""
+        self._scheduler = scheduler
+        self.when = when
+        self._seq = seq
+        self.action = action
+        self.cancelled = False
+
+    def __lt__(self, other: ScheduledCall) -> bool:
+        """Order calls by deadline, then by insertion."""
+        return (self.when, self._seq) < (other.when, other._seq)
+
+    @callback
+    def cancel(self) -> None:
+        """Cancel the call if it did not run yet."""
+        if not self.cancelled:
+            self.cancelled = True
+            self._scheduler._async_cancelled()
+
+
+class DeadlineScheduler:
+    """Run the phase timers of all partitions from a single loop timer.
+
+    Deadlines live in a heap ordered by loop time: scheduling is O(log n) and
+    cancelling is O(1), the cancelled calls being dropped when they reach the
+    top of the heap or when they outnumber the live ones. Only one loop timer
+    exists at any time, set on the earliest deadline.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._heap: list[ScheduledCall] = []
+        self._cancelled = 0
+        self._seq = count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_when: float | None = None
+        self._running = False
+        # Retard des appels par rapport a leur echeance (secondes)
+        self.fired_count = 0
+        self.drift_total = 0.0
+        self.drift_max = 0.0
+
+    @property
+    def pending_count(self) -> int:
+        """Return the number of calls waiting to run."""
+        return len(self._heap) - self._cancelled
+
+    @property
+    def has_timer(self) -> bool:
+        """Return True when a loop timer is scheduled."""
+        return self._timer is not None
+
+    @callback
+    def async_schedule(
+        self, delay: float, action: Callable[[datetime], None]
+    ) -> ScheduledCall:
+        """Run action after delay seconds and return a cancellable handle."""
+        call = ScheduledCall(self, self.hass.loop.time() + delay, next(self._seq), action)
+        heappush(self._heap, call)
+        if not self._running and (self._timer_when is None or call.when < self._timer_when):
+            self._async_set_timer(call.when)
+        return call
+
+    @callback
+    def _async_cancelled(self) -> None:
+        """Account for a cancelled call and drop dead entries."""
+        self._cancelled += 1
+        heap = self._heap
+
+        while heap and heap[0].cancelled:
+            heappop(heap)
+            self._cancelled -= 1
+
+        if self._cancelled > _COMPACT_MIN_SIZE and self._cancelled * 2 > len(heap):
+            self._heap = [call for call in heap if not call.cancelled]
+            heapify(self._heap)
+            self._cancelled = 0
+
+        if not self._heap and self._timer is not None and not self._running:
+            self._timer.cancel()
+            self._timer = None
+            self._timer_when = None
+
+    @callback
+    def _async_set_timer(self, when: float) -> None:
+        """Set the loop timer on the given loop time."""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_when = when
+        self._timer = self.hass.loop.call_at(when, self._async_run_due)
+
+    @callback
+    def _async_run_due(self) -> None:
+        """Run every call whose deadline is reached."""
+        self._timer = None
+        self._timer_when = None
+        self._running = True
+        try:
+            while self._heap and self._heap[0].when <= (now := self.hass.loop.time()):
+                call = heappop(self._heap)
+                if call.cancelled:
+                    self._cancelled -= 1
+                    continue
+                call.cancelled = True
+                drift = now - call.when
+                self.fired_count += 1
+                self.drift_total += drift
+                self.drift_max = max(self.drift_max, drift)
+                call.action(dt_util.utcnow())
+        finally:
+            self._running = False
+            if self._heap:
+                self._async_set_timer(self._heap[0].when)
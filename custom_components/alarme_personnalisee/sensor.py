@@ -5,14 +5,30 @@ import logging
 from datetime import datetime
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    SIGNAL_ALARM_UPDATED,
+    SIGNAL_SENSORS_UPDATED,
+    ATTR_CHATTERING_SENSORS,
+    ATTR_LAST_CHANGED_AT,
+    ATTR_OPEN_SENSORS,
+    ATTR_READY_TO_ARM,
+    ATTR_TRIGGERED_COUNT,
+    ATTR_UNAVAILABLE_SENSORS,
+)
+from .data import async_get_domain_data
+from .scheduler import ScheduledCall
 
 _LOGGER = logging.getLogger(__name__)
 
+# Delai de regroupement des ecritures du capteur des capteurs ouverts (secondes)
+OPEN_SENSORS_WRITE_DELAY = 1
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -20,12 +36,19 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up sensor entities."""
-    alarm_entity_id = f"alarm_control_panel.alarme"
-    
     async_add_entities([
-        TriggerCountSensor(hass, entry, alarm_entity_id),
-        LastTriggeredBySensor(hass, entry, alarm_entity_id),
-        LastChangedAtSensor(hass, entry, alarm_entity_id),
+        TriggerCountSensor(hass, entry),
+        LastTriggeredBySensor(hass, entry),
+        LastChangedAtSensor(hass, entry),
+        OpenSensorsSensor(hass, entry),
+        ChatteringSensorsSensor(hass, entry),
+        # Statistiques internes (diagnostic, desactivees par defaut)
+        LatencyStatsSensor(hass, entry, "sensor_events", "Latence capteurs"),
+        LatencyStatsSensor(hass, entry, "badge_events", "Latence badges"),
+        LatencyStatsSensor(hass, entry, "state_writes", "Latence ecriture etat"),
+        LatencyStatsSensor(hass, entry, "attributes", "Latence attributs"),
+        LatencyStatsSensor(hass, entry, "timer_drift", "Retard minuteries"),
+        IgnoredEventsSensor(hass, entry),
     ])
 
 
@@ -35,11 +58,11 @@ class AlarmBaseSensor(SensorEntity):
     _attr_has_entity_name = True
     _attr_should_poll = False
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, alarm_entity_id: str) -> None:
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the sensor."""
         self.hass = hass
         self._entry = entry
-        self._alarm_entity_id = alarm_entity_id
+        self._attr_extra_state_attributes = None
         self._attr_device_info = {
             "identifiers": {(DOMAIN, entry.entry_id)},
             "name": "Alarme Personnalisee",
@@ -51,27 +74,39 @@ class AlarmBaseSensor(SensorEntity):
         """Run when entity about to be added to hass."""
         await super().async_added_to_hass()
         
-        # Ecouter les changements de l'entite alarme
+        # Recevoir directement l'etat interne de l'alarme de cette entree
         self.async_on_remove(
-            async_track_state_change_event(
+            async_dispatcher_connect(
                 self.hass,
-                [self._alarm_entity_id],
-                self._async_alarm_state_changed,
+                SIGNAL_ALARM_UPDATED.format(self._entry.entry_id),
+                self._async_alarm_updated,
             )
         )
         
-        # Mettre a jour immediatement
-        self._update_from_alarm()
+        # Mettre a jour immediatement si l'alarme est deja chargee
+        alarm = async_get_domain_data(self.hass).async_get_entry_alarm(self._entry.entry_id)
+        if alarm is not None:
+            snapshot = alarm.snapshot()
+            self._attr_native_value = self._value_from_snapshot(snapshot)
+            self._attr_extra_state_attributes = self._attributes_from_snapshot(snapshot)
 
     @callback
-    def _async_alarm_state_changed(self, event) -> None:
-        """Handle alarm state changes."""
-        self._update_from_alarm()
-        self.async_write_ha_state()
+    def _async_alarm_updated(self, snapshot: dict) -> None:
+        """Handle an alarm snapshot pushed by the alarm entity."""
+        value = self._value_from_snapshot(snapshot)
+        attributes = self._attributes_from_snapshot(snapshot)
+        if value != self._attr_native_value or attributes != self._attr_extra_state_attributes:
+            self._attr_native_value = value
+            self._attr_extra_state_attributes = attributes
+            self.async_write_ha_state()
+
+    def _value_from_snapshot(self, snapshot: dict):
+        """Return the sensor value from an alarm snapshot - to be overridden."""
+        return None
 
-    def _update_from_alarm(self) -> None:
-        """Update sensor from alarm entity - to be overridden."""
-        pass
+    def _attributes_from_snapshot(self, snapshot: dict) -> dict | None:
+        """Return the sensor attributes from an alarm snapshot - to be overridden."""
+        return None
 
 
 class TriggerCountSensor(AlarmBaseSensor):
@@ -80,17 +115,15 @@ class TriggerCountSensor(AlarmBaseSensor):
     _attr_icon = "mdi:counter"
     _attr_native_unit_of_measurement = "declenchements"
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, alarm_entity_id: str) -> None:
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the sensor."""
-        super().__init__(hass, entry, alarm_entity_id)
+        super().__init__(hass, entry)
         self._attr_unique_id = f"{entry.entry_id}_trigger_count"
         self._attr_name = "Nombre de declenchements"
 
-    def _update_from_alarm(self) -> None:
-        """Update from alarm entity."""
-        alarm_state = self.hass.states.get(self._alarm_entity_id)
-        if alarm_state:
-            self._attr_native_value = alarm_state.attributes.get("triggered_count", 0)
+    def _value_from_snapshot(self, snapshot: dict) -> int:
+        """Return the trigger count."""
+        return snapshot[ATTR_TRIGGERED_COUNT]
 
 
 class LastTriggeredBySensor(AlarmBaseSensor):
@@ -98,26 +131,15 @@ class LastTriggeredBySensor(AlarmBaseSensor):
 
     _attr_icon = "mdi:motion-sensor"
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, alarm_entity_id: str) -> None:
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the sensor."""
-        super().__init__(hass, entry, alarm_entity_id)
+        super().__init__(hass, entry)
         self._attr_unique_id = f"{entry.entry_id}_last_triggered_by"
         self._attr_name = "Dernier capteur declencheur"
 
-    def _update_from_alarm(self) -> None:
-        """Update from alarm entity."""
-        alarm_state = self.hass.states.get(self._alarm_entity_id)
-        if alarm_state:
-            triggered_by = alarm_state.attributes.get("last_triggered_by")
-            if triggered_by:
-                # Essayer de recuperer le nom convivial du capteur
-                sensor_state = self.hass.states.get(triggered_by)
-                if sensor_state:
-                    self._attr_native_value = sensor_state.attributes.get("friendly_name", triggered_by)
-                else:
-                    self._attr_native_value = triggered_by
-            else:
-                self._attr_native_value = "Aucun"
+    def _value_from_snapshot(self, snapshot: dict) -> str:
+        """Return the friendly name of the last triggering sensor."""
+        return snapshot["last_triggered_by_name"] or "Aucun"
 
 
 class LastChangedAtSensor(AlarmBaseSensor):
@@ -126,18 +148,236 @@ class LastChangedAtSensor(AlarmBaseSensor):
     _attr_icon = "mdi:clock-outline"
     _attr_device_class = SensorDeviceClass.TIMESTAMP
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, alarm_entity_id: str) -> None:
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the sensor."""
-        super().__init__(hass, entry, alarm_entity_id)
+        super().__init__(hass, entry)
         self._attr_unique_id = f"{entry.entry_id}_last_changed_at"
         self._attr_name = "Dernier changement"
 
-    def _update_from_alarm(self) -> None:
-        """Update from alarm entity."""
-        alarm_state = self.hass.states.get(self._alarm_entity_id)
-        if alarm_state:
-            last_changed = alarm_state.attributes.get("last_changed_at")
-            if last_changed:
-                self._attr_native_value = last_changed
-            else:
-                self._attr_native_value = None
+    def _value_from_snapshot(self, snapshot: dict) -> datetime | None:
+        """Return the time of the last alarm state change."""
+        return snapshot[ATTR_LAST_CHANGED_AT]
+
+
+class OpenSensorsSensor(SensorEntity):
+    """Sensor for the monitored sensors currently open.
+
+    The alarm pushes its open and unavailable sets on SIGNAL_SENSORS_UPDATED,
+    apart from the snapshot of the other sensors. A change is written at
+    once, then the following ones at most once per OPEN_SENSORS_WRITE_DELAY:
+    the sorted lists are only built when the state is written.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_icon = "mdi:door-open"
+    _attr_native_unit_of_measurement = "capteurs"
+    # Listes completes des capteurs : la valeur suffit a l'historique
+    _unrecorded_attributes = frozenset(
+        {ATTR_OPEN_SENSORS, ATTR_UNAVAILABLE_SENSORS, ATTR_READY_TO_ARM}
+    )
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        self.hass = hass
+        self._entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_open_sensors"
+        self._attr_name = "Capteurs ouverts"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": "Alarme Personnalisee",
+            "manufacturer": "Custom",
+            "model": "Alarme Personnalisee",
+        }
+        self._open_sensors: dict[str, set[str]] = {}
+        self._unavailable_sensors: dict[str, set[str]] = {}
+        self._cooldown: ScheduledCall | None = None
+        self._write_pending = False
+        # Les plateformes se chargent en parallele : l'alarme peut publier
+        # ses capteurs avant d'etre trouvee dans async_added_to_hass
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = {}
+
+    async def async_added_to_hass(self) -> None:
+        """Run when entity about to be added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_SENSORS_UPDATED.format(self._entry.entry_id),
+                self._async_sensors_updated,
+            )
+        )
+        self.async_on_remove(self._async_cancel_cooldown)
+        
+        # Mettre a jour immediatement si l'alarme est deja chargee
+        alarm = async_get_domain_data(self.hass).async_get_entry_alarm(self._entry.entry_id)
+        if alarm is not None:
+            self._open_sensors, self._unavailable_sensors = alarm.sensor_sets()
+            self._update_from_sets()
+
+    @callback
+    def _async_sensors_updated(
+        self, open_sensors: dict[str, set[str]], unavailable_sensors: dict[str, set[str]]
+    ) -> None:
+        """Keep the sets pushed by the alarm entity and schedule a write."""
+        self._open_sensors = open_sensors
+        self._unavailable_sensors = unavailable_sensors
+        if self._cooldown is not None:
+            self._write_pending = True
+            return
+        self._async_write_sensors()
+
+    @callback
+    def _async_write_sensors(self) -> None:
+        """Write the state if the sensors changed and start the cooldown."""
+        self._write_pending = False
+        value = self._attr_native_value
+        attributes = self._attr_extra_state_attributes
+        self._update_from_sets()
+        if value != self._attr_native_value or attributes != self._attr_extra_state_attributes:
+            self.async_write_ha_state()
+        self._cooldown = async_get_domain_data(self.hass).scheduler.async_schedule(
+            OPEN_SENSORS_WRITE_DELAY, self._async_cooldown_finished
+        )
+
+    @callback
+    def _async_cooldown_finished(self, now: datetime) -> None:
+        """Write the changes received during the cooldown."""
+        self._cooldown = None
+        if self._write_pending:
+            self._async_write_sensors()
+
+    @callback
+    def _async_cancel_cooldown(self) -> None:
+        """Drop the cooldown when the entity is removed."""
+        if self._cooldown is not None:
+            self._cooldown.cancel()
+            self._cooldown = None
+
+    @callback
+    def _update_from_sets(self) -> None:
+        """Compute the value and the attributes from the alarm sets."""
+        self._attr_native_value = len(set().union(*self._open_sensors.values()))
+        self._attr_extra_state_attributes = {
+            ATTR_READY_TO_ARM: {
+                mode: not sensors for mode, sensors in self._open_sensors.items()
+            },
+            ATTR_OPEN_SENSORS: {
+                mode: sorted(sensors) for mode, sensors in self._open_sensors.items()
+            },
+            ATTR_UNAVAILABLE_SENSORS: {
+                mode: sorted(sensors) for mode, sensors in self._unavailable_sensors.items()
+            },
+        }
+
+
+class ChatteringSensorsSensor(SensorEntity):
+    """Sensor for the monitored sensors whose openings are rate limited.
+
+    Polled: suppressed openings are counted without writing any state.
+    """
+
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:alert-decagram-outline"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = "capteurs"
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        self.hass = hass
+        self._entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_chattering_sensors"
+        self._attr_name = "Capteurs instables"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": "Alarme Personnalisee",
+            "manufacturer": "Custom",
+            "model": "Alarme Personnalisee",
+        }
+
+    async def async_update(self) -> None:
+        """Read the sensor health from the alarm entity."""
+        alarm = async_get_domain_data(self.hass).async_get_entry_alarm(self._entry.entry_id)
+        if alarm is None or alarm.hass is None:
+            return
+        health = alarm.sensor_health()
+        self._attr_native_value = len(health[ATTR_CHATTERING_SENSORS])
+        self._attr_extra_state_attributes = health
+
+
+class AlarmStatsSensor(SensorEntity):
+    """Base class for the hot path statistics sensors.
+
+    The statistics change on every event: these sensors are polled instead
+    of being written by the handlers they measure.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = True
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        self.hass = hass
+        self._entry = entry
+        self._stats = async_get_domain_data(hass).entries[entry.entry_id].stats
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": "Alarme Personnalisee",
+            "manufacturer": "Custom",
+            "model": "Alarme Personnalisee",
+        }
+
+
+class LatencyStatsSensor(AlarmStatsSensor):
+    """Mean duration of a measured hot path, with its histogram."""
+
+    _attr_icon = "mdi:timer-outline"
+    # Millisecondes : unite de duree connue des statistiques long terme,
+    # trois decimales gardent la precision de la microseconde
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 3
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, key: str, name: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(hass, entry)
+        self._key = key
+        self._attr_unique_id = f"{entry.entry_id}_stats_{key}"
+        self._attr_name = name
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the mean duration."""
+        mean_us = getattr(self._stats, self._key).mean_us
+        return None if mean_us is None else round(mean_us / 1000, 3)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the count, maximum and histogram."""
+        return getattr(self._stats, self._key).as_dict()
+
+
+class IgnoredEventsSensor(AlarmStatsSensor):
+    """Number of sensor and badge events that did not act on the alarm."""
+
+    _attr_icon = "mdi:filter-outline"
+    _attr_native_unit_of_measurement = "evenements"
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(hass, entry)
+        self._attr_unique_id = f"{entry.entry_id}_stats_ignored_events"
+        self._attr_name = "Evenements ignores"
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of ignored events."""
+        return self._stats.ignored_events
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the number of events that acted on the alarm."""
+        return {"relevant_events": self._stats.relevant_events}
@@ -1,4 +1,4 @@
-"""Services for Alarme Personnalise integration."""
+"""Services for Alarme Personnalisée integration."""
 from __future__ import annotations
 
 import logging
@@ -8,6 +8,7 @@ from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.helpers import config_validation as cv
 
 from .const import DOMAIN
+from .data import async_get_domain_data
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,26 +22,21 @@ SERVICE_RESET_TRIGGER_COUNT_SCHEMA = vol.Schema(
 
 
 async def async_setup_services(hass: HomeAssistant) -> None:
-    """Set up services for Alarme Personnalise integration."""
+    """Set up services for Alarme Personnalisée integration."""
+    if hass.services.has_service(DOMAIN, SERVICE_RESET_TRIGGER_COUNT):
+        return
 
     async def async_reset_trigger_count(call: ServiceCall) -> None:
         """Reset the trigger count for the alarm."""
         entity_id = call.data.get("entity_id")
-        
-        # Get the entity from the registry
-        entity_registry = hass.data.get("entity_registry")
-        if entity_registry:
-            entity = entity_registry.async_get(entity_id)
-            if entity and entity.platform == DOMAIN:
-                # Find the alarm entity
-                for entity_obj in hass.data.get(DOMAIN, {}).values():
-                    if entity_obj.entity_id == entity_id:
-                        entity_obj._triggered_count = 0
-                        entity_obj.async_write_ha_state()
-                        _LOGGER.info("Trigger count reset for %s", entity_id)
-                        return
-        
-        _LOGGER.warning("Could not find entity %s to reset trigger count", entity_id)
+
+        alarm = async_get_domain_data(hass).async_get_alarm(entity_id)
+        if alarm is None:
+            _LOGGER.warning("Could not find entity %s to reset trigger count", entity_id)
+            return
+
+        alarm.async_reset_trigger_count()
+        _LOGGER.info("Trigger count reset for %s", entity_id)
 
     hass.services.async_register(
         DOMAIN,
@@ -51,5 +47,5 @@ async def async_setup_services(hass: HomeAssistant) -> None:
 
 
 async def async_unload_services(hass: HomeAssistant) -> None:
-    """Unload services for Alarme Personnalise integration."""
+    """Unload services for Alarme Personnalisée integration."""
     hass.services.async_remove(DOMAIN, SERVICE_RESET_TRIGGER_COUNT)
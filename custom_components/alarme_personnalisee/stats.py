@@ -0,0 +1,95 @@
+"""Runtime statistics for Alarme Personnalisee."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Bornes des classes des histogrammes (microsecondes)
+LATENCY_BUCKETS_US = (10, 50, 100, 500, 1000, 5000, 10000)
+DRIFT_BUCKETS_US = (1000, 5000, 10000, 50000, 100000, 500000, 1000000)
+
+
+class LatencyStats:
+    """Count, mean, max and histogram of durations.
+
+    Recording is a few integer operations and one bisection on a short
+    tuple, cheap enough to run on every event.
+    """
+
+    __slots__ = ("_bounds_ns", "_labels", "count", "total_ns", "max_ns", "buckets")
+
+    def __init__(self, bounds_us: tuple[int, ...] = LATENCY_BUCKETS_US) -> None:
+        """Initialize the statistics."""
+        self._bounds_ns = tuple(bound * 1000 for bound in bounds_us)
+        self._labels = [f"<={bound}us" for bound in bounds_us]
+        self._labels.append(f">{bounds_us[-1]}us")
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget every recorded duration."""
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * len(self._labels)
+
+    def record(self, elapsed_ns: int) -> None:
+        """Record a duration in nanoseconds."""
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.buckets[bisect_left(self._bounds_ns, elapsed_ns)] += 1
+
+    @property
+    def mean_us(self) -> float | None:
+        """Return the mean duration in microseconds."""
+        if not self.count:
+            return None
+        return round(self.total_ns / self.count / 1000, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics, durations in microseconds."""
+        return {
+            "count": self.count,
+            "mean_us": self.mean_us,
+            "max_us": round(self.max_ns / 1000, 1),
+            "histogram": dict(zip(self._labels, self.buckets)),
+        }
+
+
+class AlarmStats:
+    """Hot path statistics of one alarm entity."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.sensor_events = LatencyStats()
+        self.badge_events = LatencyStats()
+        self.state_writes = LatencyStats()
+        self.attributes = LatencyStats()
+        # Retard des minuteries par rapport a leur echeance
+        self.timer_drift = LatencyStats(DRIFT_BUCKETS_US)
+        # Evenements capteur/badge ayant agi sur l'alarme, ou ignores
+        self.relevant_events = 0
+        self.ignored_events = 0
+
+    def reset(self) -> None:
+        """Reset every statistic."""
+        self.sensor_events.reset()
+        self.badge_events.reset()
+        self.state_writes.reset()
+        self.attributes.reset()
+        self.timer_drift.reset()
+        self.relevant_events = 0
+        self.ignored_events = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all the statistics."""
+        return {
+            "sensor_events": self.sensor_events.as_dict(),
+            "badge_events": self.badge_events.as_dict(),
+            "state_writes": self.state_writes.as_dict(),
+            "attributes": self.attributes.as_dict(),
+            "timer_drift": self.timer_drift.as_dict(),
+            "relevant_events": self.relevant_events,
+            "ignored_events": self.ignored_events,
+        }
@@ -4,10 +4,12 @@ from __future__ import annotations
 import logging
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_OPTIONS_UPDATED
+from .data import async_get_domain_data
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,11 +28,14 @@ class RearmAfterTriggerSwitch(SwitchEntity):
 
     _attr_has_entity_name = True
     _attr_icon = "mdi:reload"
+    # Valeur tenue a jour par le signal des options : inutile de l'interroger
+    _attr_should_poll = False
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the switch."""
         self.hass = hass
         self._entry = entry
+        self._entry_data = async_get_domain_data(hass).entries[entry.entry_id]
         self._attr_unique_id = f"{entry.entry_id}_rearm_after_trigger"
         self._attr_name = "Rearmer apres declenchement"
         self._attr_device_info = {
@@ -43,25 +48,34 @@ class RearmAfterTriggerSwitch(SwitchEntity):
 
     def _update_state(self) -> None:
         """Update state from config entry options."""
-        self._attr_is_on = self._entry.options.get("rearm_after_trigger", False)
+        self._attr_is_on = self._entry_data.options.get("rearm_after_trigger", False)
 
-    @property
-    def is_on(self) -> bool:
-        """Return true if switch is on."""
-        return self._entry.options.get("rearm_after_trigger", False)
+    async def async_added_to_hass(self) -> None:
+        """Follow the option changes made elsewhere."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_OPTIONS_UPDATED.format(self._entry.entry_id),
+                self._async_options_changed,
+            )
+        )
+
+    @callback
+    def _async_options_changed(self) -> None:
+        """Write the state when the option changed."""
+        old_value = self._attr_is_on
+        self._update_state()
+        if self._attr_is_on != old_value:
+            self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the switch on."""
-        new_options = {**self._entry.options, "rearm_after_trigger": True}
-        self.hass.config_entries.async_update_entry(self._entry, options=new_options)
-        self._attr_is_on = True
-        self.async_write_ha_state()
+        # L'etat est ecrit par _async_options_changed, appele par le signal des options
+        self._entry_data.options_writer.async_set("rearm_after_trigger", True)
         _LOGGER.info("Rearm after trigger enabled")
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the switch off."""
-        new_options = {**self._entry.options, "rearm_after_trigger": False}
-        self.hass.config_entries.async_update_entry(self._entry, options=new_options)
-        self._attr_is_on = False
-        self.async_write_ha_state()
+        self._entry_data.options_writer.async_set("rearm_after_trigger", False)
         _LOGGER.info("Rearm after trigger disabled")
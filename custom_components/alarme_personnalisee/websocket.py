@@ -0,0 +1,210 @@
+"""Websocket commands for Alarme Personnalisee."""
+from __future__ import annotations
+
+from itertools import chain
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.const import ATTR_FRIENDLY_NAME
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import ATTR_MONITORED_SENSORS, DOMAIN
+from .data import async_get_domain_data
+from .journal import JOURNAL_SIZE
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_get_events)
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/events",
+        vol.Optional("entity_id"): cv.entity_id,
+        vol.Optional("before"): vol.Coerce(int),
+        vol.Optional("start_time"): cv.datetime,
+        vol.Optional("end_time"): cv.datetime,
+        vol.Optional("limit", default=50): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=JOURNAL_SIZE)
+        ),
+    }
+)
+@callback
+def websocket_get_events(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return a page of the alarm event journal, newest first.
+
+    start_time and end_time restrict the page to a time range.
+    """
+    events, next_cursor = async_get_domain_data(hass).journal.async_query(
+        msg.get("entity_id"),
+        msg.get("before"),
+        msg["limit"],
+        msg.get("start_time"),
+        msg.get("end_time"),
+    )
+    connection.send_result(msg["id"], {"events": events, "next_cursor": next_cursor})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required("entity_id"): cv.entity_id,
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream the changes of an alarm, its monitored sensors and its events."""
+    entity_id = msg["entity_id"]
+    state = hass.states.get(entity_id)
+    if state is None or async_get_domain_data(hass).async_get_alarm(entity_id) is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Alarm not found")
+        return
+
+    subscription = _AlarmSubscription(hass, connection, msg["id"], entity_id)
+    connection.subscriptions[msg["id"]] = subscription.async_unsubscribe
+    connection.send_result(msg["id"])
+    subscription.async_start(state)
+
+
+class _AlarmSubscription:
+    """Push the changes of one alarm to a websocket connection.
+
+    The first message holds the full alarm state and the state of every
+    monitored sensor. The next ones only hold what changed: the alarm state
+    and changed attributes (None for a removed one), the sensors whose state
+    changed, and the new journal events of the alarm.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        entity_id: str,
+    ) -> None:
+        """Initialize the subscription."""
+        self.hass = hass
+        self._connection = connection
+        self._msg_id = msg_id
+        self._entity_id = entity_id
+        self._domain_data = async_get_domain_data(hass)
+        # Cle de l'abonnement dans le multiplexeur des capteurs
+        self._partition = f"websocket_{id(connection)}_{msg_id}"
+        self._state: str | None = None
+        self._attributes: dict[str, Any] = {}
+        self._sensors: frozenset[str] = frozenset()
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self, state: State) -> None:
+        """Send the current state and start listening."""
+        self._unsubs.append(
+            async_track_state_change_event(
+                self.hass, self._entity_id, self._async_alarm_changed
+            )
+        )
+        self._unsubs.append(
+            self._domain_data.journal.async_add_listener(self._async_journal_event)
+        )
+        self._state = state.state
+        self._attributes = dict(state.attributes)
+        self._send(
+            {
+                "alarm": {"state": self._state, "attributes": self._attributes},
+                "sensors": self._update_sensors(),
+            }
+        )
+
+    @callback
+    def async_unsubscribe(self) -> None:
+        """Stop listening."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        self._domain_data.sensors.async_set_interest(self._partition, frozenset(), None)
+
+    @callback
+    def _send(self, data: dict[str, Any]) -> None:
+        """Send an event message to the client."""
+        self._connection.send_message(websocket_api.event_message(self._msg_id, data))
+
+    @callback
+    def _update_sensors(self) -> dict[str, dict[str, Any] | None]:
+        """Follow the monitored sensors and return the state of the new ones."""
+        monitored = self._attributes.get(ATTR_MONITORED_SENSORS) or {}
+        sensors = frozenset(chain.from_iterable(monitored.values()))
+        added = sensors - self._sensors
+        self._sensors = sensors
+        self._domain_data.sensors.async_set_interest(
+            self._partition, sensors, self._async_sensor_changed
+        )
+        return {sensor: _sensor_data(self.hass.states.get(sensor)) for sensor in added}
+
+    @callback
+    def _async_alarm_changed(self, event: Event) -> None:
+        """Send what changed in the alarm state."""
+        if (new_state := event.data["new_state"]) is None:
+            return
+
+        attributes = new_state.attributes
+        changed = {
+            key: value
+            for key, value in attributes.items()
+            if key not in self._attributes or self._attributes[key] != value
+        }
+        changed.update(
+            (key, None) for key in self._attributes if key not in attributes
+        )
+        if new_state.state == self._state and not changed:
+            return
+
+        delta: dict[str, Any] = {"attributes": changed}
+        if new_state.state != self._state:
+            delta["state"] = self._state = new_state.state
+        self._attributes = dict(attributes)
+
+        message: dict[str, Any] = {"alarm": delta}
+        if ATTR_MONITORED_SENSORS in changed and (sensors := self._update_sensors()):
+            message["sensors"] = sensors
+        self._send(message)
+
+    @callback
+    def _async_sensor_changed(self, event: Event) -> None:
+        """Send the new state of a monitored sensor."""
+        old_state = event.data["old_state"]
+        new_state = event.data["new_state"]
+        # Changement d'attributs seulement : rien a afficher
+        if old_state and new_state and old_state.state == new_state.state:
+            return
+        self._send({"sensors": {event.data["entity_id"]: _sensor_data(new_state)}})
+
+    @callback
+    def _async_journal_event(self, event: dict[str, Any]) -> None:
+        """Send a new journal event of the alarm."""
+        if event["entity_id"] == self._entity_id:
+            self._send({"events": [event]})
+
+
+def _sensor_data(state: State | None) -> dict[str, Any] | None:
+    """Return what the panel shows of a sensor."""
+    if state is None:
+        return None
+    return {
+        "state": state.state,
+        "name": state.attributes.get(ATTR_FRIENDLY_NAME, state.entity_id),
+    }
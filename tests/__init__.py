@@ -0,0 +1 @@
+"""Tests for the Alarme Personnalisee integration."""
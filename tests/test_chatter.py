@@ -0,0 +1,150 @@
+"""Tests of the per-sensor rate limit of openings."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.components.alarm_control_panel import DOMAIN as ALARM_DOMAIN
+from homeassistant.components.alarm_control_panel.const import AlarmControlPanelState
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_component import async_update_entity
+from homeassistant.util import dt as dt_util
+
+from custom_components.alarme_personnalisee.const import (
+    CONF_CHATTER_MAX_EVENTS,
+    CONF_CHATTER_WINDOW,
+    DOMAIN,
+)
+from custom_components.alarme_personnalisee.data import async_get_domain_data
+
+DOOR = "binary_sensor.door"
+CHATTERING_SENSORS = "sensor.alarme_personnalisee_capteurs_instables"
+
+
+async def _async_advance(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float
+) -> None:
+    """Move the frozen clock forward and run the timers that are due."""
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+
+async def _async_setup_alarm(hass: HomeAssistant, options: dict[str, Any]):
+    """Set up an alarm watching the door when armed away and return it."""
+    hass.states.async_set(DOOR, STATE_OFF)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        options={"arming_time": 0, "delay_time": 300, "away_sensors": [DOOR], **options},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return async_get_domain_data(hass).entries[entry.entry_id].alarm
+
+
+async def _async_service(hass: HomeAssistant, service: str, alarm) -> None:
+    """Call an alarm service."""
+    await hass.services.async_call(
+        ALARM_DOMAIN, service, {"entity_id": alarm.entity_id}, blocking=True
+    )
+    await hass.async_block_till_done()
+
+
+async def _async_arm(hass: HomeAssistant, freezer: FrozenDateTimeFactory, alarm) -> None:
+    """Arm away and let the arming delay end."""
+    await _async_service(hass, "alarm_arm_away", alarm)
+    await _async_advance(hass, freezer, 1)
+    assert alarm.state == AlarmControlPanelState.ARMED_AWAY
+
+
+async def _async_open_door(hass: HomeAssistant) -> None:
+    """Open then close the door."""
+    hass.states.async_set(DOOR, STATE_ON)
+    await hass.async_block_till_done()
+    hass.states.async_set(DOOR, STATE_OFF)
+    await hass.async_block_till_done()
+
+
+async def test_no_limit_by_default(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Without the option, no opening is ever dropped."""
+    alarm = await _async_setup_alarm(hass, {})
+    await _async_arm(hass, freezer, alarm)
+
+    for _ in range(20):
+        await _async_open_door(hass)
+
+    assert alarm.state == AlarmControlPanelState.PENDING
+    assert alarm.sensor_health() == {"chattering_sensors": [], "suppressed_events": {}}
+
+
+async def test_throttled_opening_ignored(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """An opening beyond the bucket does not start the entry delay."""
+    alarm = await _async_setup_alarm(
+        hass, {CONF_CHATTER_MAX_EVENTS: 3, CONF_CHATTER_WINDOW: 60}
+    )
+
+    for _ in range(3):
+        await _async_arm(hass, freezer, alarm)
+        await _async_open_door(hass)
+        assert alarm.state == AlarmControlPanelState.PENDING
+        await _async_service(hass, "alarm_disarm", alarm)
+
+    await _async_arm(hass, freezer, alarm)
+    await _async_open_door(hass)
+    assert alarm.state == AlarmControlPanelState.ARMED_AWAY
+    assert alarm.sensor_health() == {
+        "chattering_sensors": [DOOR],
+        "suppressed_events": {DOOR: 1},
+    }
+
+
+async def test_bucket_refill_and_chattering_cleared(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Tokens come back over the window and the mark goes once it is full."""
+    alarm = await _async_setup_alarm(
+        hass, {CONF_CHATTER_MAX_EVENTS: 3, CONF_CHATTER_WINDOW: 60}
+    )
+    await _async_arm(hass, freezer, alarm)
+
+    # Trois jetons, puis deux ouvertures ignorees
+    for _ in range(5):
+        await _async_open_door(hass)
+    assert alarm.state == AlarmControlPanelState.PENDING
+    assert alarm.sensor_health()["suppressed_events"] == {DOOR: 2}
+
+    await async_update_entity(hass, CHATTERING_SENSORS)
+    state = hass.states.get(CHATTERING_SENSORS)
+    assert state.state == "1"
+    assert state.attributes["chattering_sensors"] == [DOOR]
+
+    # Un jeton revient toutes les 20 s ; le capteur reste instable
+    await _async_advance(hass, freezer, 20)
+    await _async_open_door(hass)
+    assert alarm.sensor_health()["suppressed_events"] == {DOOR: 2}
+    await _async_open_door(hass)
+    assert alarm.sensor_health()["suppressed_events"] == {DOOR: 3}
+
+    # Le jeton repris repousse la fin de l'instabilite
+    await _async_advance(hass, freezer, 45)
+    assert alarm.sensor_health()["chattering_sensors"] == [DOOR]
+
+    await _async_advance(hass, freezer, 20)
+    await async_update_entity(hass, CHATTERING_SENSORS)
+    state = hass.states.get(CHATTERING_SENSORS)
+    assert state.state == "0"
+    assert state.attributes["chattering_sensors"] == []
+    assert state.attributes["suppressed_events"] == {DOOR: 3}
+    assert alarm.state == AlarmControlPanelState.PENDING
@@ -0,0 +1,200 @@
+"""Tests of the confirmation of an intrusion by several sensors."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.components.alarm_control_panel import DOMAIN as ALARM_DOMAIN
+from homeassistant.components.alarm_control_panel.const import AlarmControlPanelState
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.alarme_personnalisee.const import (
+    CONF_CONFIRMATION_COUNT,
+    CONF_CONFIRMATION_MODES,
+    CONF_CONFIRMATION_WINDOW,
+    CONF_SENSOR_DELAYS,
+    CONF_SKIP_CONFIRMATION_SENSORS,
+    DOMAIN,
+)
+from custom_components.alarme_personnalisee.data import async_get_domain_data
+
+DOOR = "binary_sensor.door"
+HALL = "binary_sensor.hall"
+GARAGE = "binary_sensor.garage"
+
+
+async def _async_advance(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float
+) -> None:
+    """Move the frozen clock forward and run the timers that are due."""
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+
+async def _async_setup_alarm(hass: HomeAssistant, options: dict[str, Any]):
+    """Set up an alarm confirming the openings of two sensors and return it."""
+    for sensor in (DOOR, HALL, GARAGE):
+        hass.states.async_set(sensor, STATE_OFF)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        options={
+            "arming_time": 0,
+            "delay_time": 300,
+            "away_sensors": [DOOR, HALL, GARAGE],
+            "vacation_sensors": [DOOR, HALL, GARAGE],
+            CONF_CONFIRMATION_COUNT: 2,
+            CONF_CONFIRMATION_WINDOW: 60,
+            **options,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return async_get_domain_data(hass).entries[entry.entry_id].alarm
+
+
+async def _async_arm(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    alarm,
+    service: str = "alarm_arm_vacation",
+) -> None:
+    """Arm the alarm and let the arming delay end."""
+    await hass.services.async_call(
+        ALARM_DOMAIN, service, {"entity_id": alarm.entity_id}, blocking=True
+    )
+    await _async_advance(hass, freezer, 1)
+    assert alarm.state in (
+        AlarmControlPanelState.ARMED_VACATION,
+        AlarmControlPanelState.ARMED_AWAY,
+    )
+
+
+async def _async_open(hass: HomeAssistant, sensor: str) -> None:
+    """Open then close a sensor."""
+    hass.states.async_set(sensor, STATE_ON)
+    await hass.async_block_till_done()
+    hass.states.async_set(sensor, STATE_OFF)
+    await hass.async_block_till_done()
+
+
+async def test_single_opening_without_confirmation(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Outside the confirmation modes, one opening starts the entry delay."""
+    alarm = await _async_setup_alarm(hass, {})
+    await _async_arm(hass, freezer, alarm, "alarm_arm_away")
+
+    await _async_open(hass, DOOR)
+    assert alarm.state == AlarmControlPanelState.PENDING
+
+
+async def test_single_sensor_confirmation_disabled(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A count of 1 disables the confirmation in every mode."""
+    alarm = await _async_setup_alarm(hass, {CONF_CONFIRMATION_COUNT: 1})
+    await _async_arm(hass, freezer, alarm)
+
+    await _async_open(hass, DOOR)
+    assert alarm.state == AlarmControlPanelState.PENDING
+
+
+async def test_distinct_sensors_within_window(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """The entry delay starts once enough sensors opened within the window."""
+    alarm = await _async_setup_alarm(hass, {CONF_CONFIRMATION_COUNT: 3})
+    await _async_arm(hass, freezer, alarm)
+
+    await _async_open(hass, DOOR)
+    await _async_advance(hass, freezer, 20)
+    await _async_open(hass, HALL)
+    assert alarm.state == AlarmControlPanelState.ARMED_VACATION
+
+    await _async_advance(hass, freezer, 20)
+    await _async_open(hass, GARAGE)
+    assert alarm.state == AlarmControlPanelState.PENDING
+    assert alarm._confirmation_counts == {}
+
+
+async def test_same_sensor_counted_once(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Repeated openings of one sensor do not confirm an intrusion."""
+    alarm = await _async_setup_alarm(hass, {})
+    await _async_arm(hass, freezer, alarm)
+
+    for _ in range(3):
+        await _async_open(hass, DOOR)
+        await _async_advance(hass, freezer, 5)
+    assert alarm.state == AlarmControlPanelState.ARMED_VACATION
+    assert alarm._confirmation_counts == {DOOR: 3}
+
+    await _async_open(hass, HALL)
+    assert alarm.state == AlarmControlPanelState.PENDING
+
+
+async def test_openings_outside_window(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Openings older than the window no longer count."""
+    alarm = await _async_setup_alarm(hass, {})
+    await _async_arm(hass, freezer, alarm)
+
+    await _async_open(hass, DOOR)
+    await _async_advance(hass, freezer, 40)
+    await _async_open(hass, DOOR)
+    await _async_advance(hass, freezer, 30)
+
+    # La premiere ouverture est sortie de la fenetre, pas la seconde
+    await _async_open(hass, HALL)
+    assert alarm.state == AlarmControlPanelState.PENDING
+
+    await hass.services.async_call(
+        ALARM_DOMAIN, "alarm_disarm", {"entity_id": alarm.entity_id}, blocking=True
+    )
+    await _async_arm(hass, freezer, alarm)
+
+    await _async_open(hass, DOOR)
+    await _async_advance(hass, freezer, 61)
+    await _async_open(hass, HALL)
+    assert alarm.state == AlarmControlPanelState.ARMED_VACATION
+    assert list(alarm._confirmation_counts) == [HALL]
+
+
+async def test_skip_confirmation_sensor(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A sensor skipping the confirmation starts the entry delay at once."""
+    alarm = await _async_setup_alarm(hass, {CONF_SKIP_CONFIRMATION_SENSORS: [DOOR]})
+    await _async_arm(hass, freezer, alarm)
+
+    await _async_open(hass, DOOR)
+    assert alarm.state == AlarmControlPanelState.PENDING
+
+
+async def test_zero_delay_sensor_still_confirmed(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A sensor without entry delay still waits for the confirmation."""
+    alarm = await _async_setup_alarm(
+        hass,
+        {CONF_SENSOR_DELAYS: {DOOR: 0}, CONF_CONFIRMATION_MODES: ["armed_vacation"]},
+    )
+    await _async_arm(hass, freezer, alarm)
+
+    await _async_open(hass, DOOR)
+    assert alarm.state == AlarmControlPanelState.ARMED_VACATION
+
+    await _async_open(hass, HALL)
+    assert alarm.state == AlarmControlPanelState.PENDING
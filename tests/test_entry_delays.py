@@ -0,0 +1,204 @@
+"""Tests of the per-sensor entry delays and follower sensors."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.components.alarm_control_panel import DOMAIN as ALARM_DOMAIN
+from homeassistant.components.alarm_control_panel.const import AlarmControlPanelState
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.alarme_personnalisee.const import (
+    ATTR_ENTRY_SENSOR,
+    ATTR_TIMER_DEADLINE,
+    CONF_FOLLOWER_SENSORS,
+    CONF_SENSOR_DELAYS,
+    DOMAIN,
+)
+from custom_components.alarme_personnalisee.data import async_get_domain_data
+
+DOOR = "binary_sensor.door"
+HALL = "binary_sensor.hall"
+GARAGE = "binary_sensor.garage"
+
+
+async def _async_advance(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float
+) -> None:
+    """Move the frozen clock forward and run the timers that are due."""
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+
+async def _async_setup_alarm(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, options: dict[str, Any]
+):
+    """Set up an alarm with an entry delay of 300 s, arm it away and return it."""
+    for sensor in (DOOR, HALL, GARAGE):
+        hass.states.async_set(sensor, STATE_OFF)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        options={
+            "arming_time": 0,
+            "delay_time": 300,
+            "away_sensors": [DOOR, HALL, GARAGE],
+            **options,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    alarm = async_get_domain_data(hass).entries[entry.entry_id].alarm
+
+    await hass.services.async_call(
+        ALARM_DOMAIN, "alarm_arm_away", {"entity_id": alarm.entity_id}, blocking=True
+    )
+    await _async_advance(hass, freezer, 1)
+    assert alarm.state == AlarmControlPanelState.ARMED_AWAY
+    return entry, alarm
+
+
+async def _async_open(hass: HomeAssistant, sensor: str) -> datetime:
+    """Open then close a sensor and return the time of the opening."""
+    opened_at = dt_util.utcnow()
+    hass.states.async_set(sensor, STATE_ON)
+    await hass.async_block_till_done()
+    hass.states.async_set(sensor, STATE_OFF)
+    await hass.async_block_till_done()
+    return opened_at
+
+
+def _entry_timer(hass: HomeAssistant, alarm) -> tuple[datetime, str]:
+    """Return the deadline of the entry delay and the sensor setting it."""
+    attributes = hass.states.get(alarm.entity_id).attributes
+    return (
+        dt_util.parse_datetime(attributes[ATTR_TIMER_DEADLINE]),
+        attributes[ATTR_ENTRY_SENSOR],
+    )
+
+
+async def test_follower_opened_first(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A follower opening first triggers the alarm without entry delay."""
+    _, alarm = await _async_setup_alarm(hass, freezer, {CONF_FOLLOWER_SENSORS: [HALL]})
+
+    await _async_open(hass, HALL)
+    await _async_advance(hass, freezer, 0)
+    assert alarm.state == AlarmControlPanelState.TRIGGERED
+    assert alarm._last_triggered_by == HALL
+
+
+async def test_follower_after_entry_sensor(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A follower opening during the entry delay keeps the running deadline."""
+    _, alarm = await _async_setup_alarm(hass, freezer, {CONF_FOLLOWER_SENSORS: [HALL]})
+
+    opened_at = await _async_open(hass, DOOR)
+    await _async_advance(hass, freezer, 100)
+    await _async_open(hass, HALL)
+    assert alarm.state == AlarmControlPanelState.PENDING
+    assert _entry_timer(hass, alarm) == (opened_at + timedelta(seconds=300), DOOR)
+
+    await _async_advance(hass, freezer, 199)
+    assert alarm.state == AlarmControlPanelState.PENDING
+    await _async_advance(hass, freezer, 1)
+    assert alarm.state == AlarmControlPanelState.TRIGGERED
+
+
+async def test_shorter_delay_pulls_deadline_in(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """The earliest deadline wins, a later one leaves the timer alone."""
+    _, alarm = await _async_setup_alarm(
+        hass, freezer, {CONF_SENSOR_DELAYS: {HALL: 30, GARAGE: 600}}
+    )
+
+    door_opened_at = await _async_open(hass, DOOR)
+    await _async_advance(hass, freezer, 10)
+    await _async_open(hass, GARAGE)
+    assert _entry_timer(hass, alarm) == (door_opened_at + timedelta(seconds=300), DOOR)
+
+    hall_opened_at = await _async_open(hass, HALL)
+    assert _entry_timer(hass, alarm) == (hall_opened_at + timedelta(seconds=30), HALL)
+    assert [entity_id for _, _, entity_id, _ in sorted(alarm._entry_deadlines)] == [
+        HALL,
+        DOOR,
+        GARAGE,
+    ]
+
+    await _async_advance(hass, freezer, 29)
+    assert alarm.state == AlarmControlPanelState.PENDING
+    await _async_advance(hass, freezer, 1)
+    assert alarm.state == AlarmControlPanelState.TRIGGERED
+    assert alarm._last_triggered_by == DOOR
+
+
+async def test_zero_delay_triggers_at_once(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A sensor with an entry delay of 0 triggers the alarm at once."""
+    _, alarm = await _async_setup_alarm(hass, freezer, {CONF_SENSOR_DELAYS: {GARAGE: 0}})
+
+    await _async_open(hass, GARAGE)
+    await _async_advance(hass, freezer, 0)
+    assert alarm.state == AlarmControlPanelState.TRIGGERED
+
+
+async def test_zero_delay_during_entry_delay(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A sensor with an entry delay of 0 ends a running entry delay."""
+    _, alarm = await _async_setup_alarm(hass, freezer, {CONF_SENSOR_DELAYS: {GARAGE: 0}})
+
+    await _async_open(hass, DOOR)
+    await _async_advance(hass, freezer, 10)
+    assert alarm.state == AlarmControlPanelState.PENDING
+
+    await _async_open(hass, GARAGE)
+    await _async_advance(hass, freezer, 0)
+    assert alarm.state == AlarmControlPanelState.TRIGGERED
+
+
+async def test_options_changed_during_entry_delay(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """New delays apply to the pending deadlines, keeping their start."""
+    entry, alarm = await _async_setup_alarm(
+        hass, freezer, {CONF_SENSOR_DELAYS: {HALL: 200}}
+    )
+
+    door_opened_at = await _async_open(hass, DOOR)
+    await _async_advance(hass, freezer, 50)
+    hall_opened_at = await _async_open(hass, HALL)
+    assert _entry_timer(hass, alarm) == (hall_opened_at + timedelta(seconds=200), HALL)
+
+    # Un autre reglage ne touche pas a la temporisation en cours
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, "trigger_time": 60}
+    )
+    await hass.async_block_till_done()
+    assert alarm.state == AlarmControlPanelState.PENDING
+    assert _entry_timer(hass, alarm) == (hall_opened_at + timedelta(seconds=200), HALL)
+
+    # Le delai general raccourci passe devant celui du couloir
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, "delay_time": 120}
+    )
+    await hass.async_block_till_done()
+    assert _entry_timer(hass, alarm) == (door_opened_at + timedelta(seconds=120), DOOR)
+
+    await _async_advance(hass, freezer, 69)
+    assert alarm.state == AlarmControlPanelState.PENDING
+    await _async_advance(hass, freezer, 1)
+    assert alarm.state == AlarmControlPanelState.TRIGGERED
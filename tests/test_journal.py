@@ -0,0 +1,180 @@
+"""Tests of the alarm event journal."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.alarme_personnalisee.journal import (
+    JOURNAL_MAX_AGE,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    EventJournal,
+)
+
+ALARM = "alarm_control_panel.alarme"
+OTHER_ALARM = "alarm_control_panel.garage"
+NOW = datetime(2026, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def _ids(events: list[dict[str, Any]]) -> list[int]:
+    """Return the ids of the events."""
+    return [event["id"] for event in events]
+
+
+async def _async_load_journal(
+    hass: HomeAssistant, hass_storage: dict[str, Any], events: list[dict[str, Any]]
+) -> EventJournal:
+    """Return a journal loaded from the given stored events."""
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "key": STORAGE_KEY,
+        "data": {"events": events},
+    }
+    journal = EventJournal(hass)
+    await journal.async_load()
+    return journal
+
+
+def _stored_event(event_id: int, timestamp: str) -> dict[str, Any]:
+    """Return a stored event."""
+    return {
+        "id": event_id,
+        "timestamp": timestamp,
+        "entity_id": ALARM,
+        "event_type": "armed",
+    }
+
+
+async def test_cursor_pages(hass: HomeAssistant) -> None:
+    """Pages go from the newest events to the oldest ones."""
+    journal = EventJournal(hass)
+    for index in range(10):
+        journal.async_record(ALARM if index % 2 else OTHER_ALARM, "armed")
+
+    events, cursor = journal.async_query(limit=4)
+    assert _ids(events) == [10, 9, 8, 7]
+    assert cursor == 7
+    events, cursor = journal.async_query(before=cursor, limit=4)
+    assert _ids(events) == [6, 5, 4, 3]
+    events, cursor = journal.async_query(before=cursor, limit=4)
+    assert _ids(events) == [2, 1]
+    assert cursor is None
+
+    events, cursor = journal.async_query(entity_id=ALARM, before=9, limit=2)
+    assert _ids(events) == [8, 6]
+    assert cursor == 6
+
+
+async def test_cursor_with_missing_ids(
+    hass: HomeAssistant, hass_storage: dict[str, Any], freezer: FrozenDateTimeFactory
+) -> None:
+    """The cursor does not rely on the ids following each other."""
+    freezer.move_to(NOW)
+    timestamp = NOW.isoformat()
+    journal = await _async_load_journal(
+        hass,
+        hass_storage,
+        [_stored_event(event_id, timestamp) for event_id in (1, 2, 5, 9, 10)],
+    )
+
+    assert _ids(journal.async_query(before=9)[0]) == [5, 2, 1]
+    assert _ids(journal.async_query(before=6)[0]) == [5, 2, 1]
+    assert _ids(journal.async_query(before=5)[0]) == [2, 1]
+    assert _ids(journal.async_query(before=11)[0]) == [10, 9, 5, 2, 1]
+    assert journal.async_query(before=1) == ([], None)
+
+    # Les nouveaux evenements suivent le dernier id enregistre
+    assert journal.async_record(ALARM, "disarmed")["id"] == 11
+
+
+async def test_ring_buffer_wraparound(hass: HomeAssistant) -> None:
+    """The oldest events leave the buffer and the cursor still works."""
+    journal = EventJournal(hass, maxlen=5)
+    for _ in range(12):
+        journal.async_record(ALARM, "armed")
+
+    assert len(journal) == 5
+    events, cursor = journal.async_query(limit=3)
+    assert _ids(events) == [12, 11, 10]
+    events, cursor = journal.async_query(before=cursor, limit=3)
+    assert _ids(events) == [9, 8]
+    assert cursor is None
+
+    # Curseur sur un evenement sorti du tampon
+    assert journal.async_query(before=4) == ([], None)
+
+
+async def test_time_range(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """start_time is inclusive and end_time exclusive."""
+    freezer.move_to(NOW)
+    journal = EventJournal(hass)
+    for _ in range(4):
+        journal.async_record(ALARM, "armed")
+        freezer.tick(timedelta(hours=1))
+
+    events, _ = journal.async_query(
+        start_time=NOW + timedelta(hours=1), end_time=NOW + timedelta(hours=3)
+    )
+    assert _ids(events) == [3, 2]
+
+    events, _ = journal.async_query(start_time=NOW + timedelta(minutes=30))
+    assert _ids(events) == [4, 3, 2]
+    events, _ = journal.async_query(end_time=NOW + timedelta(minutes=30), before=2)
+    assert _ids(events) == [1]
+
+    # Heure locale : la meme plage exprimee avec un decalage UTC
+    local = timezone(timedelta(hours=2))
+    events, _ = journal.async_query(
+        start_time=(NOW + timedelta(hours=1)).astimezone(local),
+        end_time=(NOW + timedelta(hours=3)).astimezone(local),
+    )
+    assert _ids(events) == [3, 2]
+
+
+async def test_time_range_mixed_offsets(
+    hass: HomeAssistant, hass_storage: dict[str, Any], freezer: FrozenDateTimeFactory
+) -> None:
+    """Events stored with different UTC offsets are compared as times."""
+    freezer.move_to(NOW)
+    journal = await _async_load_journal(
+        hass,
+        hass_storage,
+        [
+            _stored_event(1, "2026-01-10T08:00:00+00:00"),
+            # 08:30 UTC, avant 09:00 UTC mais apres 09:30 en ordre alphabetique
+            _stored_event(2, "2026-01-10T10:30:00+02:00"),
+            _stored_event(3, "2026-01-10T09:00:00+00:00"),
+            _stored_event(4, "2026-01-10T09:30:00+00:00"),
+        ],
+    )
+
+    events, _ = journal.async_query(
+        start_time=dt_util.parse_datetime("2026-01-10T08:45:00+00:00"),
+        end_time=dt_util.parse_datetime("2026-01-10T10:00:00+00:00"),
+    )
+    assert _ids(events) == [4, 3]
+
+
+async def test_old_events_compacted_on_load(
+    hass: HomeAssistant, hass_storage: dict[str, Any], freezer: FrozenDateTimeFactory
+) -> None:
+    """Events older than the retention period are dropped."""
+    freezer.move_to(NOW)
+    oldest = NOW - JOURNAL_MAX_AGE
+    journal = await _async_load_journal(
+        hass,
+        hass_storage,
+        [
+            _stored_event(1, (oldest - timedelta(minutes=1)).isoformat()),
+            # Meme instant que la limite, ecrit avec un decalage UTC
+            _stored_event(2, oldest.astimezone(timezone(timedelta(hours=-5))).isoformat()),
+            _stored_event(3, NOW.isoformat()),
+        ],
+    )
+
+    assert _ids(journal.async_query()[0]) == [3, 2]
@@ -0,0 +1,98 @@
+"""Tests of the sensor subscriptions shared between partitions."""
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import Event, HomeAssistant
+
+from custom_components.alarme_personnalisee.const import DOMAIN
+from custom_components.alarme_personnalisee.data import async_get_domain_data
+from custom_components.alarme_personnalisee.multiplexer import SensorMultiplexer
+
+DOOR = "binary_sensor.door"
+HALL = "binary_sensor.hall"
+GARAGE = "binary_sensor.garage"
+
+
+async def _async_toggle(hass: HomeAssistant, *sensors: str) -> None:
+    """Open then close the sensors."""
+    for state in (STATE_ON, STATE_OFF):
+        for sensor in sensors:
+            hass.states.async_set(sensor, state)
+    await hass.async_block_till_done()
+
+
+async def test_shared_sensor_single_subscription(hass: HomeAssistant) -> None:
+    """A shared sensor is subscribed once and dispatched to each partition."""
+    multiplexer = SensorMultiplexer(hass)
+    received: dict[str, list[str]] = {"house": [], "garage": []}
+
+    def _listener(partition: str):
+        return lambda event: received[partition].append(event.data["entity_id"])
+
+    multiplexer.async_set_interest("house", frozenset({DOOR, HALL}), _listener("house"))
+    multiplexer.async_set_interest("garage", frozenset({HALL, GARAGE}), _listener("garage"))
+    assert multiplexer.subscription_count == 3
+
+    await _async_toggle(hass, DOOR, HALL, GARAGE)
+    assert received == {"house": [DOOR, HALL] * 2, "garage": [HALL, GARAGE] * 2}
+
+
+async def test_removed_partition_keeps_shared_sensors(hass: HomeAssistant) -> None:
+    """Removing a partition drops only the sensors no one else listens to."""
+    multiplexer = SensorMultiplexer(hass)
+    received: list[Event] = []
+    multiplexer.async_set_interest("house", frozenset({DOOR, HALL}), received.append)
+    multiplexer.async_set_interest("garage", frozenset({HALL, GARAGE}), received.append)
+
+    multiplexer.async_set_interest("house", frozenset(), None)
+    assert multiplexer.subscription_count == 2
+    assert "house" not in multiplexer._interests
+
+    await _async_toggle(hass, DOOR, HALL, GARAGE)
+    assert [event.data["entity_id"] for event in received] == [HALL, GARAGE] * 2
+
+    multiplexer.async_set_interest("garage", frozenset(), None)
+    assert multiplexer.subscription_count == 0
+    assert multiplexer._listeners == {}
+
+    received.clear()
+    await _async_toggle(hass, DOOR, HALL, GARAGE)
+    assert received == []
+
+
+async def test_changed_interest_subscribes_difference(hass: HomeAssistant) -> None:
+    """Changing the sensors of a partition only (un)subscribes the difference."""
+    multiplexer = SensorMultiplexer(hass)
+    multiplexer.async_set_interest("house", frozenset({DOOR, HALL}), lambda event: None)
+    unsub_hall = multiplexer._unsubs[HALL]
+
+    multiplexer.async_set_interest("house", frozenset({HALL, GARAGE}), lambda event: None)
+    assert set(multiplexer._unsubs) == {HALL, GARAGE}
+    assert multiplexer._unsubs[HALL] is unsub_hall
+
+
+async def test_unloaded_entry_releases_its_sensors(hass: HomeAssistant) -> None:
+    """Unloading a config entry keeps the sensors still used by another one."""
+    for sensor in (DOOR, HALL, GARAGE):
+        hass.states.async_set(sensor, STATE_OFF)
+    entries = []
+    for sensors in ([DOOR, HALL], [HALL, GARAGE]):
+        entry = MockConfigEntry(domain=DOMAIN, options={"away_sensors": sensors})
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        entries.append(entry)
+
+    multiplexer = async_get_domain_data(hass).sensors
+    assert set(multiplexer._unsubs) == {DOOR, HALL, GARAGE}
+
+    assert await hass.config_entries.async_unload(entries[0].entry_id)
+    await hass.async_block_till_done()
+    assert set(multiplexer._unsubs) == {HALL, GARAGE}
+    assert list(multiplexer._listeners[HALL]) == [entries[1].entry_id]
+
+    assert await hass.config_entries.async_unload(entries[1].entry_id)
+    await hass.async_block_till_done()
+    assert multiplexer.subscription_count == 0
@@ -0,0 +1,135 @@
+"""Tests of the options changed from the number and switch entities."""
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.components.number import DOMAIN as NUMBER_DOMAIN
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from custom_components.alarme_personnalisee.const import DOMAIN
+from custom_components.alarme_personnalisee.data import async_get_domain_data
+from custom_components.alarme_personnalisee.options import OPTIONS_WRITE_DELAY
+
+
+async def _async_setup_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Set up a config entry."""
+    entry = MockConfigEntry(domain=DOMAIN, options={"delay_time": 30})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _async_set_delay(hass: HomeAssistant, entry: MockConfigEntry, value: float) -> None:
+    """Change the entry delay from its number entity."""
+    number = er.async_get(hass).async_get_entity_id(
+        NUMBER_DOMAIN, DOMAIN, f"{entry.entry_id}_delay_time"
+    )
+    await hass.services.async_call(
+        NUMBER_DOMAIN, "set_value", {"entity_id": number, "value": value}, blocking=True
+    )
+
+
+async def _async_flush(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Let the options writer store its pending changes."""
+    freezer.tick(timedelta(seconds=OPTIONS_WRITE_DELAY))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+
+async def test_number_written_once(hass: HomeAssistant) -> None:
+    """A new value is applied at once and its state written once."""
+    entry = await _async_setup_entry(hass)
+    number = er.async_get(hass).async_get_entity_id(
+        NUMBER_DOMAIN, DOMAIN, f"{entry.entry_id}_delay_time"
+    )
+    entity = hass.data[NUMBER_DOMAIN].get_entity(number)
+
+    with patch.object(
+        entity, "async_write_ha_state", wraps=entity.async_write_ha_state
+    ) as write_state:
+        await hass.services.async_call(
+            NUMBER_DOMAIN, "set_value", {"entity_id": number, "value": 45}, blocking=True
+        )
+        await hass.async_block_till_done()
+
+    assert float(hass.states.get(number).state) == 45
+    assert async_get_domain_data(hass).entries[entry.entry_id].alarm._delay_time == 45
+    assert write_state.call_count == 1
+
+
+async def test_switch_written_once(hass: HomeAssistant) -> None:
+    """Turning the switch on writes its state once."""
+    entry = await _async_setup_entry(hass)
+    switch = er.async_get(hass).async_get_entity_id(
+        SWITCH_DOMAIN, DOMAIN, f"{entry.entry_id}_rearm_after_trigger"
+    )
+    entity = hass.data[SWITCH_DOMAIN].get_entity(switch)
+
+    with patch.object(
+        entity, "async_write_ha_state", wraps=entity.async_write_ha_state
+    ) as write_state:
+        await hass.services.async_call(
+            SWITCH_DOMAIN, "turn_on", {"entity_id": switch}, blocking=True
+        )
+        await hass.async_block_till_done()
+
+    assert hass.states.get(switch).state == STATE_ON
+    assert write_state.call_count == 1
+
+
+async def test_options_flow_overrides_pending_change(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A value saved from the options flow is not overwritten by the flush."""
+    entry = await _async_setup_entry(hass)
+    alarm = async_get_domain_data(hass).entries[entry.entry_id].alarm
+    await _async_set_delay(hass, entry, 10)
+
+    # Le formulaire affiche la valeur en attente
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": "general"}
+    )
+    defaults = {str(key): key.default() for key in result["data_schema"].schema}
+    assert defaults["delay_time"] == 10
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {**defaults, "delay_time": 45}
+    )
+    await hass.async_block_till_done()
+    await _async_flush(hass, freezer)
+
+    assert entry.options["delay_time"] == 45
+    assert alarm._delay_time == 45
+
+
+async def test_external_update_keeps_other_pending_changes(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """An update of other options keeps the pending change and stores it."""
+    entry = await _async_setup_entry(hass)
+    alarm = async_get_domain_data(hass).entries[entry.entry_id].alarm
+    await _async_set_delay(hass, entry, 10)
+
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, "trigger_time": 60}
+    )
+    await hass.async_block_till_done()
+    assert alarm._delay_time == 10
+
+    await _async_flush(hass, freezer)
+    assert entry.options["delay_time"] == 10
+    assert entry.options["trigger_time"] == 60
+    assert alarm._delay_time == 10
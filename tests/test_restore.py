@@ -0,0 +1,80 @@
+"""Tests of the alarm state restored on startup."""
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    mock_restore_cache_with_extra_data,
+)
+
+from homeassistant.components.alarm_control_panel.const import AlarmControlPanelState
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant, State
+
+from custom_components.alarme_personnalisee.const import DOMAIN
+from custom_components.alarme_personnalisee.data import async_get_domain_data
+
+ALARM = "alarm_control_panel.alarme"
+WINDOW = "binary_sensor.window"
+
+
+async def _async_setup_armed_alarm(hass: HomeAssistant):
+    """Restore an alarm armed away and return it."""
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State(ALARM, AlarmControlPanelState.ARMED_AWAY),
+                {
+                    "state": AlarmControlPanelState.ARMED_AWAY,
+                    "last_armed_state": AlarmControlPanelState.ARMED_AWAY,
+                    "triggered_count": 2,
+                },
+            )
+        ],
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN, options={"delay_time": 30, "away_sensors": [WINDOW]}
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return async_get_domain_data(hass).entries[entry.entry_id].alarm
+
+
+async def test_restore_armed_state(hass: HomeAssistant) -> None:
+    """The armed state and the counters survive a restart."""
+    hass.states.async_set(WINDOW, STATE_OFF)
+    alarm = await _async_setup_armed_alarm(hass)
+
+    assert alarm.entity_id == ALARM
+    assert hass.states.get(ALARM).state == AlarmControlPanelState.ARMED_AWAY
+    assert hass.states.get(ALARM).attributes["triggered_count"] == 2
+
+
+async def test_sensor_loaded_open_after_restore(hass: HomeAssistant) -> None:
+    """A sensor whose state appears already open is not an intrusion."""
+    alarm = await _async_setup_armed_alarm(hass)
+
+    # Integration du capteur chargee apres l'alarme : la fenetre etait ouverte
+    hass.states.async_set(WINDOW, STATE_ON)
+    await hass.async_block_till_done()
+    assert hass.states.get(ALARM).state == AlarmControlPanelState.ARMED_AWAY
+    assert alarm.sensor_sets()[0][AlarmControlPanelState.ARMED_AWAY] == {WINDOW}
+
+    # Fermee puis rouverte : une vraie ouverture
+    hass.states.async_set(WINDOW, STATE_OFF)
+    hass.states.async_set(WINDOW, STATE_ON)
+    await hass.async_block_till_done()
+    assert hass.states.get(ALARM).state == AlarmControlPanelState.PENDING
+
+
+async def test_sensor_back_from_unavailable_open(hass: HomeAssistant) -> None:
+    """A sensor coming back already open after a reconnection is not an intrusion."""
+    hass.states.async_set(WINDOW, STATE_OFF)
+    await _async_setup_armed_alarm(hass)
+
+    hass.states.async_set(WINDOW, "unavailable")
+    await hass.async_block_till_done()
+    hass.states.async_set(WINDOW, STATE_ON)
+    await hass.async_block_till_done()
+    assert hass.states.get(ALARM).state == AlarmControlPanelState.ARMED_AWAY
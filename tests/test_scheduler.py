@@ -0,0 +1,164 @@
+"""Tests of the shared deadline scheduler."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.alarme_personnalisee.scheduler import (
+    _COMPACT_MIN_SIZE,
+    DeadlineScheduler,
+)
+
+
+async def _async_advance(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float
+) -> None:
+    """Move the frozen clock forward and run the timers that are due."""
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+
+def _loop_timers(hass: HomeAssistant, scheduler: DeadlineScheduler) -> list:
+    """Return the live loop timers set by the scheduler."""
+    return [
+        handle
+        for handle in hass.loop._scheduled
+        if not handle.cancelled() and handle._callback == scheduler._async_run_due
+    ]
+
+
+async def test_single_loop_timer(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Calls run in deadline order from one loop timer."""
+    scheduler = DeadlineScheduler(hass)
+    fired = []
+    for delay in (30, 10, 20):
+        scheduler.async_schedule(delay, lambda now, delay=delay: fired.append(delay))
+
+    assert scheduler.pending_count == 3
+    assert len(_loop_timers(hass, scheduler)) == 1
+
+    await _async_advance(hass, freezer, 15)
+    assert fired == [10]
+    assert len(_loop_timers(hass, scheduler)) == 1
+
+    await _async_advance(hass, freezer, 15)
+    assert fired == [10, 20, 30]
+    assert scheduler.pending_count == 0
+    assert not scheduler.has_timer
+    assert _loop_timers(hass, scheduler) == []
+
+
+async def test_earlier_deadline_moves_timer(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A call due before the timer moves the timer instead of adding one."""
+    scheduler = DeadlineScheduler(hass)
+    fired = []
+    scheduler.async_schedule(60, lambda now: fired.append("late"))
+    (late_timer,) = _loop_timers(hass, scheduler)
+
+    scheduler.async_schedule(5, lambda now: fired.append("early"))
+    (timer,) = _loop_timers(hass, scheduler)
+    assert timer is not late_timer
+    assert timer.when() < late_timer.when()
+
+    # Une echeance plus lointaine ne touche pas au minuteur
+    scheduler.async_schedule(30, lambda now: fired.append("middle"))
+    assert _loop_timers(hass, scheduler) == [timer]
+
+    await _async_advance(hass, freezer, 5)
+    assert fired == ["early"]
+    assert len(_loop_timers(hass, scheduler)) == 1
+
+    await _async_advance(hass, freezer, 55)
+    assert fired == ["early", "middle", "late"]
+    assert not scheduler.has_timer
+
+
+async def test_call_scheduled_from_a_call(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A call scheduled while calls run keeps a single loop timer."""
+    scheduler = DeadlineScheduler(hass)
+    fired = []
+
+    def _reschedule(now) -> None:
+        fired.append("first")
+        scheduler.async_schedule(1, lambda now: fired.append("second"))
+
+    scheduler.async_schedule(1, _reschedule)
+    await _async_advance(hass, freezer, 1)
+    assert fired == ["first"]
+    assert len(_loop_timers(hass, scheduler)) == 1
+
+    await _async_advance(hass, freezer, 1)
+    assert fired == ["first", "second"]
+    assert not scheduler.has_timer
+
+
+async def test_cancel_head(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Cancelling the earliest call drops it and keeps the next one."""
+    scheduler = DeadlineScheduler(hass)
+    fired = []
+    head = scheduler.async_schedule(5, lambda now: fired.append("head"))
+    scheduler.async_schedule(10, lambda now: fired.append("next"))
+
+    head.cancel()
+    head.cancel()
+    assert scheduler.pending_count == 1
+    assert scheduler._heap[0] is not head
+    assert len(_loop_timers(hass, scheduler)) == 1
+
+    await _async_advance(hass, freezer, 5)
+    assert fired == []
+    assert len(_loop_timers(hass, scheduler)) == 1
+
+    await _async_advance(hass, freezer, 5)
+    assert fired == ["next"]
+
+
+async def test_cancel_last_call_drops_timer(hass: HomeAssistant) -> None:
+    """No loop timer is left once every call is cancelled."""
+    scheduler = DeadlineScheduler(hass)
+    calls = [scheduler.async_schedule(delay, lambda now: None) for delay in (5, 10)]
+
+    calls[1].cancel()
+    assert scheduler.has_timer
+    calls[0].cancel()
+    assert scheduler.pending_count == 0
+    assert scheduler._heap == []
+    assert not scheduler.has_timer
+    assert _loop_timers(hass, scheduler) == []
+
+
+async def test_cancelled_calls_compacted(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Cancelled calls behind the head are removed once they are the majority."""
+    scheduler = DeadlineScheduler(hass)
+    fired = []
+    calls = [
+        scheduler.async_schedule(delay, lambda now, delay=delay: fired.append(delay))
+        for delay in range(1, 4 * _COMPACT_MIN_SIZE + 1)
+    ]
+
+    # Annulation depuis la fin : la tete reste vivante, rien n'est retire
+    for call in reversed(calls[2 * _COMPACT_MIN_SIZE :]):
+        call.cancel()
+    assert len(scheduler._heap) == len(calls)
+    assert scheduler.pending_count == 2 * _COMPACT_MIN_SIZE
+
+    calls[2 * _COMPACT_MIN_SIZE - 1].cancel()
+    assert len(scheduler._heap) == scheduler.pending_count == 2 * _COMPACT_MIN_SIZE - 1
+    assert scheduler._cancelled == 0
+    assert len(_loop_timers(hass, scheduler)) == 1
+
+    await _async_advance(hass, freezer, 4 * _COMPACT_MIN_SIZE)
+    assert fired == list(range(1, 2 * _COMPACT_MIN_SIZE))
+    assert not scheduler.has_timer
@@ -0,0 +1,108 @@
+"""Tests of the open sensors sensor."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.components.alarm_control_panel.const import AlarmControlPanelState
+from homeassistant.components.sensor import DEVICE_CLASS_UNITS
+from homeassistant.const import STATE_OFF, STATE_ON, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.alarme_personnalisee.const import DOMAIN
+from custom_components.alarme_personnalisee.sensor import (
+    OPEN_SENSORS_WRITE_DELAY,
+    LatencyStatsSensor,
+    OpenSensorsSensor,
+)
+
+OPEN_SENSORS = "sensor.alarme_personnalisee_capteurs_ouverts"
+DOOR = "binary_sensor.door"
+WINDOW = "binary_sensor.window"
+
+
+async def _async_advance(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float
+) -> None:
+    """Move the frozen clock forward and run the timers that are due."""
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+
+async def _async_setup_alarm(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Set up a disarmed alarm watching the door and the window."""
+    hass.states.async_set(DOOR, STATE_OFF)
+    hass.states.async_set(WINDOW, STATE_OFF)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        options={"away_sensors": [DOOR, WINDOW], "home_sensors": [DOOR]},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    # Fin de l'attente qui suit la premiere ecriture, selon l'ordre des plateformes
+    await _async_advance(hass, freezer, OPEN_SENSORS_WRITE_DELAY)
+
+
+async def test_open_sensors_by_mode(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Open and unavailable sensors are listed per mode while disarmed."""
+    await _async_setup_alarm(hass, freezer)
+    assert hass.states.get(OPEN_SENSORS).state == "0"
+
+    hass.states.async_set(WINDOW, STATE_ON)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(OPEN_SENSORS)
+    assert state.state == "1"
+    assert state.attributes["open_sensors"][AlarmControlPanelState.ARMED_AWAY] == [WINDOW]
+    assert state.attributes["open_sensors"][AlarmControlPanelState.ARMED_HOME] == []
+    assert state.attributes["ready_to_arm"][AlarmControlPanelState.ARMED_AWAY] is False
+    assert state.attributes["ready_to_arm"][AlarmControlPanelState.ARMED_HOME] is True
+
+
+async def test_changes_written_after_cooldown(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Changes following a write are grouped until the cooldown ends."""
+    await _async_setup_alarm(hass, freezer)
+    hass.states.async_set(WINDOW, STATE_ON)
+    await hass.async_block_till_done()
+    assert hass.states.get(OPEN_SENSORS).state == "1"
+
+    hass.states.async_set(DOOR, STATE_ON)
+    hass.states.async_set(WINDOW, STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    assert hass.states.get(OPEN_SENSORS).state == "1"
+
+    await _async_advance(hass, freezer, OPEN_SENSORS_WRITE_DELAY)
+
+    state = hass.states.get(OPEN_SENSORS)
+    assert state.state == "1"
+    assert state.attributes["open_sensors"][AlarmControlPanelState.ARMED_AWAY] == [DOOR]
+    assert state.attributes["unavailable_sensors"][AlarmControlPanelState.ARMED_AWAY] == [
+        WINDOW
+    ]
+
+
+def test_sensor_lists_not_recorded() -> None:
+    """The full sensor lists are kept out of the recorder."""
+    assert OpenSensorsSensor._unrecorded_attributes == {
+        "open_sensors",
+        "unavailable_sensors",
+        "ready_to_arm",
+    }
+
+
+def test_latency_unit_known_to_device_class() -> None:
+    """The statistics are reported in a unit of their device class."""
+    sensor = LatencyStatsSensor.__new__(LatencyStatsSensor)
+    assert sensor.native_unit_of_measurement in DEVICE_CLASS_UNITS[sensor.device_class]
@@ -0,0 +1,278 @@
+"""Soak test: repeated cycles must not leak listeners, subscriptions or timers.
+
+The default run is short. The long run (thousands of sensors, hours of
+simulated time) is marked slow: run it with ``pytest -m slow``.
+"""
+from __future__ import annotations
+
+import gc
+import json
+import logging
+import tracemalloc
+from collections.abc import Generator
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    CLIENT_ID,
+    MockConfigEntry,
+    MockUser,
+    async_fire_time_changed,
+)
+
+from homeassistant.components import websocket_api
+from homeassistant.components.alarm_control_panel import DOMAIN as ALARM_DOMAIN
+from homeassistant.components.alarm_control_panel.const import AlarmControlPanelState
+from homeassistant.components.number import DOMAIN as NUMBER_DOMAIN
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from custom_components.alarme_personnalisee.const import (
+    CONF_BADGE_ENTITY,
+    CONF_BADGE_NAME,
+    CONF_BADGES,
+    CONF_CHATTER_MAX_EVENTS,
+    CONF_MIN_ON_TIME,
+    DOMAIN,
+)
+from custom_components.alarme_personnalisee.data import async_get_domain_data
+
+_LOGGER = logging.getLogger(__name__)
+
+SETTLE = 600
+SETTLE_STEP = 10
+BADGE_READER = "sensor.badge_reader"
+
+
+async def _async_advance(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float
+) -> None:
+    """Move the frozen clock forward and run the timers that are due."""
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+
+async def _async_settle(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Let SETTLE seconds pass, running the timers as they come due."""
+    for _ in range(SETTLE // SETTLE_STEP):
+        await _async_advance(hass, freezer, SETTLE_STEP)
+
+
+def _message(message: Any) -> dict[str, Any]:
+    """Return a websocket message, decoded when it was sent serialized."""
+    if isinstance(message, (bytes, str)):
+        return json.loads(message)
+    return message
+
+
+def _resources(hass: HomeAssistant) -> dict[str, Any]:
+    """Return what a leak would make grow."""
+    domain_data = async_get_domain_data(hass)
+    return {
+        "bus_listeners": hass.bus.async_listeners(),
+        "sensor_subscriptions": domain_data.sensors.subscription_count,
+        "sensor_partitions": len(domain_data.sensors._interests),
+        "scheduled_calls": domain_data.scheduler.pending_count,
+        "scheduler_timer": domain_data.scheduler.has_timer,
+        "journal_listeners": len(domain_data.journal._listeners),
+        "journal_unsaved": domain_data.journal._unsaved,
+        "loop_timers": sum(
+            1 for handle in hass.loop._scheduled if not handle.cancelled()
+        ),
+    }
+
+
+def _memory() -> tuple[int, int]:
+    """Return the traced memory and the number of objects tracked by the gc."""
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0], len(gc.get_objects())
+
+
+@pytest.fixture
+def traced_memory() -> Generator[None, None, None]:
+    """Trace the memory allocations during the test."""
+    tracemalloc.start()
+    yield
+    tracemalloc.stop()
+
+
+async def _async_setup_entry(hass: HomeAssistant, options: dict[str, Any]) -> MockConfigEntry:
+    """Set up a config entry."""
+    entry = MockConfigEntry(domain=DOMAIN, options=options)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+@pytest.mark.parametrize(
+    ("sensor_count", "cycles"),
+    [
+        pytest.param(10, 20, id="short"),
+        pytest.param(2000, 24, id="long", marks=pytest.mark.slow),
+    ],
+)
+async def test_soak_returns_to_baseline(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    hass_admin_user: MockUser,
+    traced_memory: None,
+    caplog: pytest.LogCaptureFixture,
+    record_property,
+    sensor_count: int,
+    cycles: int,
+) -> None:
+    """Flap sensors, scan badges, change options and reload, then compare.
+
+    The resources are checked after each cycle, once the timers ran out,
+    and the memory growth per simulated hour is reported.
+    """
+    sensors_list = [f"binary_sensor.door_{index}" for index in range(sensor_count)]
+    half = sensor_count // 2
+    hass.states.async_set(BADGE_READER, STATE_OFF)
+    for sensor in sensors_list:
+        hass.states.async_set(sensor, STATE_OFF)
+
+    # Deux partitions qui partagent une partie de leurs capteurs
+    entry = await _async_setup_entry(
+        hass,
+        {
+            "arming_time": 5,
+            "delay_time": 10,
+            "trigger_time": 20,
+            "away_sensors": sensors_list,
+            "home_sensors": sensors_list[:half],
+            CONF_CHATTER_MAX_EVENTS: 3,
+            CONF_BADGES: [{CONF_BADGE_ENTITY: BADGE_READER, CONF_BADGE_NAME: "Badge"}],
+        },
+    )
+    other_entry = await _async_setup_entry(
+        hass,
+        {"arming_time": 0, "away_sensors": sensors_list[half:], CONF_MIN_ON_TIME: 2},
+    )
+    domain_data = async_get_domain_data(hass)
+    registry = er.async_get(hass)
+    delay_number = registry.async_get_entity_id(
+        NUMBER_DOMAIN, DOMAIN, f"{entry.entry_id}_delay_time"
+    )
+    rearm_switch = registry.async_get_entity_id(
+        SWITCH_DOMAIN, DOMAIN, f"{entry.entry_id}_rearm_after_trigger"
+    )
+    assert await async_setup_component(hass, "websocket_api", {})
+    refresh_token = await hass.auth.async_create_refresh_token(hass_admin_user, CLIENT_ID)
+
+    await _async_settle(hass, freezer)
+    baseline = _resources(hass)
+    # Les journaux gardes par pytest fausseraient la mesure de la memoire
+    start = dt_util.utcnow()
+    memory = []
+    with caplog.at_level(logging.ERROR):
+
+        for cycle in range(cycles):
+            alarm = domain_data.entries[entry.entry_id].alarm
+            other_alarm = domain_data.entries[other_entry.entry_id].alarm
+
+            # Panneau ouvert : abonnement websocket au journal et aux capteurs
+            messages = []
+            connection = websocket_api.ActiveConnection(
+                _LOGGER, hass, messages.append, hass_admin_user, refresh_token
+            )
+            connection.async_handle(
+                {"id": 1, "type": f"{DOMAIN}/subscribe", "entity_id": alarm.entity_id}
+            )
+            assert _message(messages[0])["success"]
+
+            # Armer les deux partitions
+            for entity_id in (alarm.entity_id, other_alarm.entity_id):
+                await hass.services.async_call(
+                    ALARM_DOMAIN, "alarm_arm_away", {"entity_id": entity_id}, blocking=True
+                )
+            await _async_advance(hass, freezer, 6)
+            assert alarm.state == AlarmControlPanelState.ARMED_AWAY
+
+            # Capteurs qui battent : delai d'entree, rebonds et capteurs instables
+            for flap in range(5):
+                for sensor in sensors_list:
+                    hass.states.async_set(sensor, STATE_ON)
+                await hass.async_block_till_done()
+                if flap == 0:
+                    await _async_advance(hass, freezer, 1)
+                for sensor in sensors_list:
+                    hass.states.async_set(sensor, STATE_OFF)
+                await hass.async_block_till_done()
+            assert alarm.state == AlarmControlPanelState.PENDING
+
+            # Laisser une partition se declencher, desarmer l'autre par badge
+            if cycle % 2:
+                await _async_advance(hass, freezer, 11)
+                assert alarm.state == AlarmControlPanelState.TRIGGERED
+            hass.states.async_set(BADGE_READER, str(cycle))
+            await hass.async_block_till_done()
+            hass.states.async_set(BADGE_READER, STATE_OFF)
+            await hass.async_block_till_done()
+            assert alarm.state == AlarmControlPanelState.DISARMED
+            await hass.services.async_call(
+                ALARM_DOMAIN, "alarm_disarm", {"entity_id": other_alarm.entity_id}, blocking=True
+            )
+
+            # Options modifiees par les entites number/switch (OptionsWriter)
+            await hass.services.async_call(
+                NUMBER_DOMAIN,
+                "set_value",
+                {"entity_id": delay_number, "value": 10 + 5 * (cycle % 2)},
+                blocking=True,
+            )
+            await hass.services.async_call(
+                SWITCH_DOMAIN,
+                "turn_on" if cycle % 2 else "turn_off",
+                {"entity_id": rearm_switch},
+                blocking=True,
+            )
+
+            # Options modifiees par le flux d'options (_async_options_updated)
+            sensors = sensors_list[: half + cycle % 5]
+            hass.config_entries.async_update_entry(
+                other_entry, options={**other_entry.options, "away_sensors": sensors}
+            )
+            await hass.async_block_till_done()
+
+            # Panneau ferme : la connexion se termine sans desabonnement explicite
+            assert len(messages) > 1
+            connection.async_handle_close()
+
+            # Rechargement d'une entree
+            if cycle % 5 == 4:
+                assert await hass.config_entries.async_reload(other_entry.entry_id)
+                await hass.async_block_till_done()
+
+            # Remettre les capteurs de depart, puis laisser les temporisations finir
+            hass.config_entries.async_update_entry(
+                other_entry, options={**other_entry.options, "away_sensors": sensors_list[half:]}
+            )
+            await _async_settle(hass, freezer)
+            assert _resources(hass) == baseline, f"cycle {cycle}"
+            memory.append((dt_util.utcnow(), *_memory()))
+
+    # Croissance entre le premier et le dernier cycle, rapportee a une heure
+    (first_time, first_bytes, first_objects) = memory[0]
+    (last_time, last_bytes, last_objects) = memory[-1]
+    hours = (last_time - first_time).total_seconds() / 3600
+    bytes_per_hour = (last_bytes - first_bytes) / hours
+    objects_per_hour = (last_objects - first_objects) / hours
+    record_property("simulated_hours", round((last_time - start).total_seconds() / 3600, 2))
+    record_property("memory_growth_bytes_per_hour", round(bytes_per_hour))
+    record_property("object_growth_per_hour", round(objects_per_hour))
+    _LOGGER.info(
+        "Soak: %s sensors, %s cycles, %.0f bytes and %.0f objects per simulated hour",
+        sensor_count,
+        cycles,
+        bytes_per_hour,
+        objects_per_hour,
+    )